@@ -81,21 +81,27 @@ def compresion_lz77(ruta_archivo, tam_ventana_historia, tam_ventana_futura, arch
 
     return datos_comprimidos
 
-# Parámetros de configuración. cONFIGURAR CON EL NOMBRE DEL ARCHIVO NECESARIO
-ruta_archivo = '/content/Pulcino_pio_prueba.txt'
-archivo_salida = '/content/resultado_compresion.txt'
 
-matricula = 2078068
-snm = suma_digitos(matricula)
-print(f"La suma de los dígitos de {matricula} es: {snm}")
+def main():
+    # Parámetros de configuración. cONFIGURAR CON EL NOMBRE DEL ARCHIVO NECESARIO
+    ruta_archivo = '/content/Pulcino_pio_prueba.txt'
+    archivo_salida = '/content/resultado_compresion.txt'
 
-tam_ventana_historia = round(snm * (2 / 3))
-print(f"El tamaño de la ventana histórica es: {tam_ventana_historia}")
+    matricula = 2078068
+    snm = suma_digitos(matricula)
+    print(f"La suma de los dígitos de {matricula} es: {snm}")
 
-tam_ventana_futura = snm - tam_ventana_historia
-print(f"El tamaño de la ventana futura es: {tam_ventana_futura}")
+    tam_ventana_historia = round(snm * (2 / 3))
+    print(f"El tamaño de la ventana histórica es: {tam_ventana_historia}")
 
-## EJECUTABLE
-resultado = compresion_lz77(ruta_archivo, tam_ventana_historia, tam_ventana_futura, archivo_salida)
+    tam_ventana_futura = snm - tam_ventana_historia
+    print(f"El tamaño de la ventana futura es: {tam_ventana_futura}")
 
-print(f"Resultados guardados en {archivo_salida}")
\ No newline at end of file
+    ## EJECUTABLE
+    resultado = compresion_lz77(ruta_archivo, tam_ventana_historia, tam_ventana_futura, archivo_salida)
+
+    print(f"Resultados guardados en {archivo_salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+from functools import lru_cache
+
+NO_OF_CHARS = 256
+
+VARIANTS = ("boyer-moore", "horspool", "sunday")
+
+
+class ShiftTable(dict):
+    """Symbol -> value table for text patterns; absent symbols get `default`."""
+
+    def __init__(self, default: int):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, key) -> int:
+        return self.default
+
+
+def is_binary(pat) -> bool:
+    return isinstance(pat, (bytes, bytearray, memoryview))
+
+
+def _table(pat, default: int):
+    """256-entry list for byte patterns, a `ShiftTable` for text."""
+    return [default] * NO_OF_CHARS if is_binary(pat) else ShiftTable(default)
+
+
+def bad_char_heuristic(string, size: int):
+    bad_char = _table(string, -1)
+
+    for i in range(size):
+        bad_char[string[i]] = i
+
+    return bad_char
+
+
+def good_suffix_table(pat) -> list[int]:
+    """Strong good-suffix shifts: `shift[j + 1]` after a mismatch at `j`.
+
+    `shift[0]` is the shift after a full match (the pattern's period). Built
+    from the border positions of every suffix, in O(m).
+    """
+    m = len(pat)
+    shift = [0] * (m + 1)
+    border = [0] * (m + 1)
+
+    # Case 1: the matched suffix occurs again, preceded by another symbol
+    i, j = m, m + 1
+    border[i] = j
+    while i > 0:
+        while j <= m and pat[i - 1] != pat[j - 1]:
+            if shift[j] == 0:
+                shift[j] = j - i
+            j = border[j]
+        i -= 1
+        j -= 1
+        border[i] = j
+
+    # Case 2: only a prefix of the pattern matches a part of the suffix
+    j = border[0]
+    for i in range(m + 1):
+        if shift[i] == 0:
+            shift[i] = j
+        if i == j:
+            j = border[j]
+    return shift
+
+
+def horspool_table(pat):
+    """Shift by the window's last symbol, from its last occurrence in pat[:-1]."""
+    m = len(pat)
+    tabla = _table(pat, m)
+    for i in range(m - 1):
+        tabla[pat[i]] = m - 1 - i
+    return tabla
+
+
+def sunday_table(pat):
+    """Shift by the symbol just after the window."""
+    m = len(pat)
+    tabla = _table(pat, m + 1)
+    for i in range(m):
+        tabla[pat[i]] = m - i
+    return tabla
+
+
+def choose_variant(pat) -> str:
+    """Variant expected to scan `pat` fastest.
+
+    Short patterns gain most from Sunday's look past the window; patterns
+    over a few symbols (DNA) repeat their suffixes, where the good-suffix
+    rule pays off; everything else gets Horspool's single lookup per shift.
+    """
+    if len(pat) < 4:
+        return "sunday"
+    if len(set(pat)) <= 4:
+        return "boyer-moore"
+    return "horspool"
+
+
+def print_alignment(txt: str, pat: str, shift: int):
+    t_line = "T\t"
+    p_line = "P\t"
+
+    for i in range(len(txt)):
+        t_line += txt[i] + " "
+
+    for i in range(shift):
+        p_line += "  "
+    for i in range(len(pat)):
+        p_line += pat[i] + " "
+
+    print(t_line)
+    print(p_line)
+
+
+def print_alignment_detailed(txt: str, pat: str, shift: int, bc=None, gs=None):
+    print("-" * 60)
+    t_line = "T\t"
+    p_line = "P\t"
+
+    for i in range(len(txt)):
+        t_line += txt[i] + " "
+
+    for i in range(shift):
+        p_line += "  "
+    for i in range(len(pat)):
+        p_line += pat[i] + " "
+
+    if bc is not None:
+        t_line += f"\tBC: {bc}"
+    if gs is not None:
+        p_line += f"\tGS: {gs}"
+
+    print(t_line)
+    print(p_line)
+    print("-" * 60)
+
+
+class CompiledPattern:
+    """A pattern preprocessed once for one of the `VARIANTS`.
+
+    Byte patterns (`bytes`, `bytearray`, `memoryview`) get 256-entry shift
+    lists and search `bytes`-like text; `str` patterns get `ShiftTable`
+    dicts, so any code point works. Get them through `compile`, which keeps
+    the most recently used ones.
+    """
+
+    def __init__(self, pattern, variant: str = "auto"):
+        if not pattern:
+            raise ValueError("Empty pattern")
+        if variant == "auto":
+            variant = choose_variant(pattern)
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant: {variant}")
+        self.pattern = pattern
+        self.variant = variant
+        self.binario = is_binary(pattern)
+        m = len(pattern)
+        if variant == "boyer-moore":
+            self.bad_char = bad_char_heuristic(pattern, m)
+            self.good_suffix = good_suffix_table(pattern)
+        elif variant == "horspool":
+            self.shifts = horspool_table(pattern)
+        else:
+            self.shifts = sunday_table(pattern)
+
+    def __repr__(self) -> str:
+        return f"CompiledPattern({self.pattern!r}, variant={self.variant!r})"
+
+    def search(self, txt) -> list[int]:
+        """0-based offsets of every (possibly overlapping) occurrence in `txt`."""
+        if is_binary(txt) != self.binario:
+            raise TypeError("Pattern and text must both be bytes-like or both str")
+        if self.variant == "boyer-moore":
+            return self._boyer_moore(txt)
+        if self.variant == "horspool":
+            return self._horspool(txt)
+        return self._sunday(txt)
+
+    def _lookup(self, tabla):
+        # ShiftTable.__missing__ is a Python call; the scans use dict.get instead
+        return self.binario, None if self.binario else tabla.get
+
+    def _boyer_moore(self, txt) -> list[int]:
+        pat = self.pattern
+        bad_char = self.bad_char
+        good_suffix = self.good_suffix
+        binario, get = self._lookup(bad_char)
+        m = len(pat)
+        n = len(txt)
+        occurrences = []
+        s = 0
+        while s <= n - m:
+            j = m - 1
+            while j >= 0 and pat[j] == txt[s + j]:
+                j -= 1
+            if j < 0:
+                occurrences.append(s)
+                s += good_suffix[0]
+            else:
+                c = txt[s + j]
+                ultima = bad_char[c] if binario else get(c, -1)
+                s += max(j - ultima, good_suffix[j + 1])
+        return occurrences
+
+    def _horspool(self, txt) -> list[int]:
+        pat = self.pattern
+        shifts = self.shifts
+        binario, get = self._lookup(shifts)
+        m = len(pat)
+        n = len(txt)
+        occurrences = []
+        s = 0
+        while s <= n - m:
+            if txt[s : s + m] == pat:
+                occurrences.append(s)
+            c = txt[s + m - 1]
+            s += shifts[c] if binario else get(c, m)
+        return occurrences
+
+    def _sunday(self, txt) -> list[int]:
+        pat = self.pattern
+        shifts = self.shifts
+        binario, get = self._lookup(shifts)
+        m = len(pat)
+        n = len(txt)
+        occurrences = []
+        s = 0
+        while s <= n - m:
+            if txt[s : s + m] == pat:
+                occurrences.append(s)
+            if s + m >= n:
+                break
+            c = txt[s + m]
+            s += shifts[c] if binario else get(c, m + 1)
+        return occurrences
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern, variant: str) -> CompiledPattern:
+    return CompiledPattern(pattern, variant)
+
+
+def compile(pattern, variant: str = "auto") -> CompiledPattern:
+    """Compiled `pattern`, reused from an LRU cache of the last 256 patterns."""
+    if isinstance(pattern, (bytearray, memoryview)):
+        pattern = bytes(pattern)
+    return _compile(pattern, variant)
+
+
+def search(txt, pat, visualize=False, variant: str = "boyer-moore"):
+    """Offsets of `pat` in `txt` through the cached compiled pattern.
+
+    `visualize` prints every alignment and shift; it only applies to `str`
+    input with the "boyer-moore" variant and otherwise is ignored.
+    """
+    patron = compile(pat, variant)
+    if not (visualize and variant == "boyer-moore" and isinstance(txt, str)):
+        return patron.search(txt)
+
+    m = len(pat)
+    n = len(txt)
+
+    bad_char = patron.bad_char
+    good_suffix = patron.good_suffix
+
+    s = 0
+
+    occurrences = []
+
+    while s <= n - m:
+        j = m - 1
+
+        while j >= 0 and pat[j] == txt[s + j]:
+            j -= 1
+
+        if j < 0:
+            occurrences.append(s)
+            print_alignment_detailed(txt, pat, s, None, good_suffix[0])
+            print(f"Pattern found at position {s}")
+            print(f"Shift by {good_suffix[0]} using Good Suffix rule")
+            s += good_suffix[0]
+        else:
+            bad_char_shift = j - bad_char[txt[s + j]]
+            good_suffix_shift = good_suffix[j + 1]
+            shift = max(bad_char_shift, good_suffix_shift)
+
+            print_alignment_detailed(txt, pat, s, bad_char_shift, good_suffix_shift)
+            rule = (
+                "Bad Character"
+                if bad_char_shift >= good_suffix_shift
+                else "Good Suffix"
+            )
+            print(f"Shift by {shift} using {rule} rule")
+
+            s += shift
+
+    return occurrences
+
+
+def horspool_search(txt, pat) -> list[int]:
+    return compile(pat, "horspool").search(txt)
+
+
+def sunday_search(txt, pat) -> list[int]:
+    return compile(pat, "sunday").search(txt)
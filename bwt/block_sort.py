@@ -0,0 +1,278 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable
+
+import numpy as np
+
+from huffman.canonical import canonical_codewords, code_lengths
+from lz77.deflate import read_lengths, write_lengths
+from sufix_tree.suffix_array import suffix_array
+from teoria_info.bitstream import (
+    WINDOW_MASK,
+    PrefixDecoder,
+    pack_codewords,
+    read_varint,
+    write_varint,
+)
+from teoria_info.container import read_stream_varint
+
+# Bytes per block, as bzip2 -9
+BLOCK_SIZE = 900_000
+# Zero runs are written in bijective base 2 with these two digits (1 and 2)
+RUNA = 0
+RUNB = 1
+# RUNA, RUNB, then every MTF index but 0 shifted up by one
+SYMBOLS = 257
+
+MAGIC = b"TBWT"
+
+
+def bwt(data: bytes) -> tuple[np.ndarray, int]:
+    """Burrows-Wheeler transform through the suffix array of `data`.
+
+    The text is sorted as if it ended in a unique smallest terminal: the
+    last column of that sort is returned without the terminal, along with
+    the row it was removed from.
+    """
+    datos = np.frombuffer(data, dtype=np.uint8)
+    sa = np.concatenate(([len(datos)], suffix_array(data)))
+    primario = int(np.flatnonzero(sa == 0)[0])
+    ultima = datos[np.delete(sa, primario) - 1]
+    return ultima, primario
+
+
+def inverse_bwt(ultima: np.ndarray, primario: int) -> bytes:
+    """Rebuild the text from the last column, vectorized by pointer jumping.
+
+    LF maps every row to the row of the suffix one symbol longer. Following
+    LF from a row reaches the terminal row after as many steps as the
+    position its suffix starts at. Doubling the jumps gives every distance
+    in log2(n) passes, and each row then puts its last symbol in place.
+    """
+    n = len(ultima)
+    if n == 0:
+        return b""
+    # The terminal sorts first, so LF is the stable sort of the column with it
+    columna = np.insert(ultima.astype(np.int64), primario, -1)
+    lf = np.empty(n + 1, dtype=np.int64)
+    lf[np.argsort(columna, kind="stable")] = np.arange(n + 1)
+
+    distancia = np.ones(n + 1, dtype=np.int64)
+    distancia[primario] = 0
+    siguiente = lf.copy()
+    siguiente[primario] = primario
+    while (siguiente != primario).any():
+        distancia += distancia[siguiente]
+        siguiente = siguiente[siguiente]
+
+    texto = np.empty(n, dtype=np.uint8)
+    filas = np.flatnonzero(distancia > 0)
+    texto[distancia[filas] - 1] = columna[filas]
+    return texto.tobytes()
+
+
+def mtf_encode(datos: np.ndarray) -> np.ndarray:
+    """Move-to-front indices, from the list 0..255, without a per-byte loop.
+
+    A byte seen before sits behind exactly the distinct bytes used since its
+    previous occurrence. A new byte sits behind every byte used so far and
+    the unused ones smaller than it. Both counts are accumulated with one
+    vectorized pass per distinct byte of the block.
+    """
+    n = len(datos)
+    posiciones = np.arange(n)
+    orden = np.argsort(datos, kind="stable")
+    previa = np.full(n, -1, dtype=np.int64)
+    mismo = datos[orden[1:]] == datos[orden[:-1]]
+    previa[orden[1:][mismo]] = orden[:-1][mismo]
+
+    indices = np.zeros(n, dtype=np.int64)
+    vistos_menores = np.zeros(n, dtype=np.int64)
+    for simbolo in np.unique(datos).tolist():
+        ultima = np.maximum.accumulate(np.where(datos == simbolo, posiciones, -1))
+        # Last use of `simbolo` strictly before every position
+        antes = np.concatenate(([-1], ultima[:-1]))
+        indices += antes > previa
+        vistos_menores += (antes >= 0) & (simbolo < datos)
+    nuevo = previa < 0
+    indices[nuevo] += datos[nuevo] - vistos_menores[nuevo]
+    return indices
+
+
+def mtf_decode(indices: np.ndarray) -> np.ndarray:
+    lista = list(range(256))
+    salida = bytearray(len(indices))
+    for i, k in enumerate(indices.tolist()):
+        if k:
+            simbolo = lista.pop(k)
+            lista.insert(0, simbolo)
+        salida[i] = lista[0]
+    return np.frombuffer(bytes(salida), dtype=np.uint8)
+
+
+def rle_zeros(indices: np.ndarray) -> np.ndarray:
+    """Runs of MTF zeros as RUNA/RUNB digits, other indices shifted up by one.
+
+    A run of length L is the bits of L + 1 below its leading one, least
+    significant first: 0 is RUNA and 1 is RUNB.
+    """
+    cero = indices == 0
+    bordes = np.diff(np.concatenate(([0], cero.astype(np.int8), [0])))
+    inicios = np.flatnonzero(bordes == 1)
+    largos = np.flatnonzero(bordes == -1) - inicios
+    digitos = np.frexp((largos + 1).astype(np.float64))[1] - 1
+
+    # Symbols produced by every index: 1, or the digits at the start of a run
+    tamanos = (~cero).astype(np.int64)
+    tamanos[inicios] = digitos
+    destino = np.cumsum(tamanos) - tamanos
+    salida = np.empty(int(tamanos.sum()), dtype=np.int64)
+    salida[destino[~cero]] = indices[~cero] + 1
+
+    corrida = np.repeat(np.arange(len(inicios)), digitos)
+    j = np.arange(len(corrida)) - np.repeat(np.cumsum(digitos) - digitos, digitos)
+    salida[destino[inicios][corrida] + j] = ((largos + 1)[corrida] >> j) & 1
+    return salida
+
+
+def unrle_zeros(simbolos: np.ndarray) -> np.ndarray:
+    corrida = simbolos <= RUNB
+    inicio = corrida & ~np.concatenate(([False], corrida[:-1]))
+    grupo = np.cumsum(inicio) - 1
+    # Digit position inside its run, then the run length its digits add up to
+    indices = np.arange(len(simbolos))
+    posicion = indices - np.maximum.accumulate(np.where(inicio, indices, 0))
+    peso = np.where(corrida, (simbolos + 1) << np.where(corrida, posicion, 0), 0)
+    largos = np.bincount(grupo[corrida], weights=peso[corrida], minlength=1)
+    largos = largos.astype(np.int64)
+
+    guardar = ~corrida | inicio
+    valores = np.where(corrida, 0, simbolos - 1)[guardar]
+    cuentas = np.where(inicio, largos[np.maximum(grupo, 0)], 1)[guardar]
+    return np.repeat(valores, cuentas)
+
+
+def encode_block(data: bytes) -> bytes:
+    """[size][primary row][code lengths][symbol count][bit size][codewords]."""
+    ultima, primario = bwt(data)
+    simbolos = rle_zeros(mtf_encode(ultima))
+    longitudes = code_lengths(np.bincount(simbolos, minlength=SYMBOLS))
+    codigos = canonical_codewords(longitudes)
+    empaquetado = pack_codewords(codigos[simbolos], longitudes[simbolos])
+    return (
+        write_varint(len(data))
+        + write_varint(primario)
+        + write_lengths(longitudes)
+        + write_varint(len(simbolos))
+        + write_varint(len(empaquetado))
+        + empaquetado
+    )
+
+
+def decode_block(payload: bytes) -> bytes:
+    tamano, offset = read_varint(payload, 0)
+    primario, offset = read_varint(payload, offset)
+    longitudes, offset = read_lengths(payload, offset, SYMBOLS)
+    total, offset = read_varint(payload, offset)
+    bytes_codigo, offset = read_varint(payload, offset)
+    datos = payload[offset : offset + bytes_codigo] + bytes(8)
+
+    decoder = PrefixDecoder(
+        np.arange(SYMBOLS), canonical_codewords(longitudes), longitudes
+    )
+    table_symbol = decoder.table_symbol
+    table_length = decoder.table_length
+    shift = decoder.shift
+    simbolos = [0] * total
+    position = 0
+    for i in range(total):
+        byte = position >> 3
+        window = (
+            int.from_bytes(datos[byte : byte + 8], "big") >> (8 - (position & 7))
+        ) & WINDOW_MASK
+        length = table_length[window >> shift]
+        if length:
+            simbolos[i] = table_symbol[window >> shift]
+        else:
+            simbolos[i], length = decoder.slow(window)
+        position += length
+
+    indices = unrle_zeros(np.array(simbolos, dtype=np.int64))
+    texto = inverse_bwt(mtf_decode(indices), primario)
+    if len(texto) != tamano:
+        raise ValueError("Corrupt BWT block")
+    return texto
+
+
+def _encode(data: bytes, block_size: int, mapa: Callable = map) -> bytes:
+    bloques = [data[i : i + block_size] for i in range(0, len(data), block_size)]
+    return b"".join(write_varint(len(p)) + p for p in mapa(encode_block, bloques))
+
+
+def _split(payload: bytes) -> Iterable[bytes]:
+    offset = 0
+    while offset < len(payload):
+        tamano, offset = read_varint(payload, offset)
+        yield payload[offset : offset + tamano]
+        offset += tamano
+
+
+def encode(data: bytes, block_size: int = BLOCK_SIZE, workers: int = 1) -> bytes:
+    """BWT, MTF, zero-run RLE and canonical Huffman over independent blocks.
+
+    Every block is `[varint payload size][payload]`, so the blocks can be
+    coded and decoded in any order. With more than one worker they run
+    across a process pool.
+    """
+    if workers == 1 or len(data) <= block_size:
+        return _encode(data, block_size)
+    with ProcessPoolExecutor(workers) as pool:
+        return _encode(data, block_size, pool.map)
+
+
+def decode(payload: bytes, workers: int = 1) -> bytes:
+    bloques = list(_split(payload))
+    if workers == 1 or len(bloques) <= 1:
+        return b"".join(map(decode_block, bloques))
+    with ProcessPoolExecutor(workers) as pool:
+        return b"".join(pool.map(decode_block, bloques))
+
+
+def compress_file(
+    ruta_entrada: str,
+    ruta_salida: str,
+    block_size: int = BLOCK_SIZE,
+    workers: int | None = None,
+) -> None:
+    """Compress a file, one batch of blocks per round across a process pool."""
+    lote = block_size * (workers or os.cpu_count() or 1)
+    with (
+        ProcessPoolExecutor(workers) as pool,
+        open(ruta_entrada, "rb") as entrada,
+        open(ruta_salida, "wb") as salida,
+    ):
+        salida.write(MAGIC)
+        while datos := entrada.read(lote):
+            salida.write(_encode(datos, block_size, pool.map))
+
+
+def decompress_file(
+    ruta_entrada: str, ruta_salida: str, workers: int | None = None
+) -> None:
+    lote = workers or os.cpu_count() or 1
+    with (
+        ProcessPoolExecutor(workers) as pool,
+        open(ruta_entrada, "rb") as entrada,
+        open(ruta_salida, "wb") as salida,
+    ):
+        if entrada.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a BWT container")
+
+        def payloads():
+            while entrada.read(1):
+                entrada.seek(-1, 1)
+                yield entrada.read(read_stream_varint(entrada))
+
+        for bloques in itertools.batched(payloads(), lote):
+            salida.writelines(pool.map(decode_block, bloques))
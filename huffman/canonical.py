@@ -0,0 +1,38 @@
+import numpy as np
+
+from .balanced import construir_arbol_huffman, generar_codificacion_huffman
+
+
+def code_lengths(counts: np.ndarray) -> np.ndarray:
+    """Huffman code length of every symbol of an alphabet, 0 if it never occurs.
+
+    The tree comes from `balanced.construir_arbol_huffman`; only the depth of
+    each leaf is kept, since the codewords are reassigned canonically.
+    """
+    lengths = np.zeros(len(counts), dtype=np.int64)
+    present = np.flatnonzero(counts)
+    if len(present) == 1:
+        lengths[present] = 1
+    elif len(present) > 1:
+        tree = construir_arbol_huffman(
+            {int(s): int(counts[s]) for s in present.tolist()}
+        )
+        for symbol, code in generar_codificacion_huffman(tree, "", {}).items():
+            lengths[symbol] = len(code)
+    return lengths
+
+
+def canonical_codewords(lengths: np.ndarray) -> np.ndarray:
+    """Canonical codewords for the given lengths: by length, then by symbol."""
+    codewords = np.zeros(len(lengths), dtype=np.uint64)
+    code = 0
+    previous = 0
+    for symbol in np.lexsort((np.arange(len(lengths)), lengths)).tolist():
+        length = int(lengths[symbol])
+        if length == 0:
+            continue
+        code <<= length - previous
+        codewords[symbol] = code
+        code += 1
+        previous = length
+    return codewords
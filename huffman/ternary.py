@@ -1,6 +1,5 @@
 from math import log2
-from utils.utils import sort_and_order_frequencies
-import polars as pl
+from .utils.utils import sort_and_order_frequencies
 
 
 def calculate_fi(frequencies: list[tuple[str, int]]) -> tuple[int, list[float]]:
@@ -76,6 +75,8 @@ def print_table(frequencies: list[tuple[str, int]], codes: dict[str, str]) -> No
 
     lms = sum(f * nc for f, nc in zip(fi, needed_chars))
 
+    import polars as pl
+
     char_df = pl.DataFrame(
         {
             "CHAR": chars,
@@ -0,0 +1,140 @@
+import re
+from array import array
+from collections import deque
+from typing import Iterator, Sequence
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton: the prefix function generalized to a trie.
+
+    Every state is a prefix of some pattern, and its failure link points to
+    the longest proper suffix of it that is also a prefix, as
+    `prefix_function` does for a single pattern. Byte patterns get a dense
+    automaton (256 transitions per state, failures already folded in); text
+    patterns keep a dict of children per state and follow the failure links.
+    Each state also links to the nearest state on its failure chain that
+    ends a pattern, so reporting costs one step per match.
+
+    Like `KMPMatcher`, `feed` carries the state between chunks and yields
+    `(offset, pattern index)` with absolute 0-based offsets. While in the
+    root, the scan jumps to the next symbol that starts some pattern with
+    a compiled character class.
+    """
+
+    def __init__(self, patterns: Sequence):
+        if not patterns or not all(patterns):
+            raise ValueError("Patterns must be non-empty")
+        self.patterns = list(patterns)
+        self.binario = isinstance(self.patterns[0], (bytes, bytearray))
+        self.longitudes = [len(p) for p in self.patterns]
+
+        hijos: list[dict] = [{}]
+        self.salidas: list[list[int]] = [[]]
+        for indice, patron in enumerate(self.patterns):
+            estado = 0
+            for simbolo in patron:
+                siguiente = hijos[estado].get(simbolo)
+                if siguiente is None:
+                    siguiente = len(hijos)
+                    hijos[estado][simbolo] = siguiente
+                    hijos.append({})
+                    self.salidas.append([])
+                estado = siguiente
+            self.salidas[estado].append(indice)
+
+        n = len(hijos)
+        self.fallo = array("i", [0]) * n
+        self.enlace_salida = array("i", [-1]) * n
+        self.hijos = hijos
+        self.transiciones = (
+            [array("i", [0]) * 256 for _ in range(n)] if self.binario else None
+        )
+
+        # Breadth first, so the failure of every parent is known first
+        cola = deque()
+        for simbolo, hijo in hijos[0].items():
+            cola.append(hijo)
+            if self.binario:
+                self.transiciones[0][simbolo] = hijo
+        while cola:
+            estado = cola.popleft()
+            fallo = self.fallo[estado]
+            self.enlace_salida[estado] = (
+                fallo if self.salidas[fallo] else self.enlace_salida[fallo]
+            )
+            if self.binario:
+                self.transiciones[estado][:] = self.transiciones[fallo]
+            for simbolo, hijo in hijos[estado].items():
+                cola.append(hijo)
+                self.fallo[hijo] = self._step(fallo, simbolo)
+                if self.binario:
+                    self.transiciones[estado][simbolo] = hijo
+
+        iniciales = sorted(hijos[0])
+        if self.binario:
+            clase = b"[" + b"".join(re.escape(bytes([s])) for s in iniciales) + b"]"
+        else:
+            clase = "[" + "".join(re.escape(s) for s in iniciales) + "]"
+        self._salto = re.compile(clase)
+        self.reset()
+
+    def _step(self, estado: int, simbolo) -> int:
+        if self.binario:
+            return self.transiciones[estado][simbolo]
+        hijos, fallo = self.hijos, self.fallo
+        while estado and simbolo not in hijos[estado]:
+            estado = fallo[estado]
+        return hijos[estado].get(simbolo, 0)
+
+    def reset(self) -> None:
+        self.estado = 0
+        self.posicion = 0
+
+    def feed(self, chunk) -> Iterator[tuple[int, int]]:
+        estado = self.estado
+        base = self.posicion
+        salidas, enlace = self.salidas, self.enlace_salida
+        longitudes = self.longitudes
+        saltar = self._salto.search
+        transiciones = self.transiciones
+        hijos, fallo = self.hijos, self.fallo
+        n = len(chunk)
+        i = 0
+        while i < n:
+            if estado == 0:
+                encontrado = saltar(chunk, i)
+                if encontrado is None:
+                    break
+                i = encontrado.start()
+            simbolo = chunk[i]
+            if transiciones is not None:
+                estado = transiciones[estado][simbolo]
+            else:
+                while estado and simbolo not in hijos[estado]:
+                    estado = fallo[estado]
+                estado = hijos[estado].get(simbolo, 0)
+            i += 1
+
+            reporta = estado if salidas[estado] else enlace[estado]
+            while reporta > 0:
+                for indice in salidas[reporta]:
+                    yield base + i - longitudes[indice], indice
+                reporta = enlace[reporta]
+        self.estado = estado
+        self.posicion = base + n
+
+    def search(self, text) -> list[tuple[int, int]]:
+        """Every `(offset, pattern index)` in `text`, by end position."""
+        self.reset()
+        resultado = list(self.feed(text))
+        self.reset()
+        return resultado
+
+
+def search_file(
+    patterns: Sequence[bytes], ruta: str, chunk_size: int = 1 << 20
+) -> Iterator[tuple[int, int]]:
+    automata = AhoCorasick(patterns)
+    with open(ruta, "rb") as archivo:
+        while chunk := archivo.read(chunk_size):
+            yield from automata.feed(chunk)
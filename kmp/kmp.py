@@ -0,0 +1,154 @@
+import mmap
+from array import array
+from typing import Iterator
+
+
+def prefix_function(p: str):
+    m = len(p)
+    a = [0] * m
+
+    # Length of the previous longest prefix suffix
+    k = 0
+    i = 1
+
+    # Loop calculates a[i] for i = 1 to M-1
+    while i < m:
+        if p[i] == p[k]:
+            k += 1
+            a[i] = k
+            i += 1
+        else:
+            if k != 0:
+                k = a[k - 1]
+            else:
+                a[i] = 0
+                i += 1
+    return a
+
+
+def search(p: str, s: str):
+    m = len(p)
+    n = len(s)
+
+    a = prefix_function(p)
+    result = []
+
+    i = 0  # index for txt
+    j = 0  # index for pattern
+    while (n - i) >= (m - j):
+        if p[j] == s[i]:
+            j += 1
+            i += 1
+
+        if j == m:
+            result.append(i - j + 1)
+            j = a[j - 1]
+        elif i < n and p[j] != s[i]:
+            if j != 0:
+                j = a[j - 1]
+            else:
+                i += 1
+    return result
+
+
+class KMPMatcher:
+    """KMP automaton compiled once and fed the text chunk by chunk.
+
+    `estado` (how much of the pattern the text currently ends with) and
+    `posicion` (symbols consumed so far) carry over between calls to `feed`,
+    so a match split across chunks is still found and reported at its
+    absolute 0-based offset. Byte patterns get a dense DFA with 256
+    transitions per state; text patterns step through the prefix function.
+    While no prefix of the pattern is pending the matcher jumps straight to
+    the next occurrence of the first symbol with `find`.
+    """
+
+    def __init__(self, pattern):
+        if not pattern:
+            raise ValueError("Empty pattern")
+        self.pattern = pattern
+        self.prefijo = prefix_function(pattern)
+        self.binario = isinstance(pattern, (bytes, bytearray))
+        self.dfa = self._dfa() if self.binario else None
+        self.reset()
+
+    def reset(self) -> None:
+        self.estado = 0
+        self.posicion = 0
+
+    def _dfa(self) -> list[array]:
+        """dfa[j][b]: state after reading byte b in state j (j < len(pattern))."""
+        p = self.pattern
+        m = len(p)
+        dfa = [array("i", [0]) * 256 for _ in range(m + 1)]
+        dfa[0][p[0]] = 1
+        reinicio = 0
+        for j in range(1, m + 1):
+            dfa[j][:] = dfa[reinicio]
+            if j < m:
+                dfa[j][p[j]] = j + 1
+                reinicio = dfa[reinicio][p[j]]
+        return dfa
+
+    def feed(self, chunk) -> Iterator[int]:
+        """Offsets of the matches that end inside `chunk`."""
+        m = len(self.pattern)
+        primero = self.pattern[:1]
+        estado = self.estado
+        base = self.posicion
+        n = len(chunk)
+        i = 0
+        if self.binario:
+            dfa = self.dfa
+            while i < n:
+                if estado == 0:
+                    i = chunk.find(primero, i)
+                    if i < 0:
+                        i = n
+                        break
+                estado = dfa[estado][chunk[i]]
+                i += 1
+                if estado == m:
+                    yield base + i - m
+        else:
+            p = self.pattern
+            prefijo = self.prefijo
+            while i < n:
+                if estado == 0:
+                    i = chunk.find(primero, i)
+                    if i < 0:
+                        i = n
+                        break
+                c = chunk[i]
+                while estado and (estado == m or p[estado] != c):
+                    estado = prefijo[estado - 1]
+                if p[estado] == c:
+                    estado += 1
+                i += 1
+                if estado == m:
+                    yield base + i - m
+        self.estado = estado
+        self.posicion = base + n
+
+
+def search_stream(pattern, archivo, chunk_size: int = 1 << 20) -> Iterator[int]:
+    """Match offsets in a file object opened in binary (or text) mode."""
+    matcher = KMPMatcher(pattern)
+    while chunk := archivo.read(chunk_size):
+        yield from matcher.feed(chunk)
+
+
+def search_file(
+    pattern: bytes, ruta: str, chunk_size: int = 1 << 20, use_mmap: bool = False
+) -> Iterator[int]:
+    """Byte offsets of `pattern` in a file, reading at most `chunk_size` at a time."""
+    with open(ruta, "rb") as archivo:
+        if not use_mmap:
+            yield from search_stream(pattern, archivo, chunk_size)
+            return
+        if not archivo.seek(0, 2):
+            return
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            matcher = KMPMatcher(pattern)
+            for inicio in range(0, len(mapa), chunk_size):
+                yield from matcher.feed(mapa[inicio : inicio + chunk_size])
@@ -0,0 +1,76 @@
+import os
+import time
+
+from .match_finders import FINDERS
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "..", "pia", "samples")
+
+
+def parse(buscador, n: int) -> tuple[int, int]:
+    """Greedy parse of the first `n` symbols; returns (tokens, matched symbols)."""
+    posicion = 0
+    tokens = 0
+    coincidencias = 0
+    while posicion < n:
+        _, longitud = buscador.find(posicion)
+        posicion += longitud + 1
+        coincidencias += longitud
+        tokens += 1
+    return tokens, coincidencias
+
+
+def benchmark(
+    archivos: list[str],
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    finders: list[str],
+    limite: int,
+    limite_fuerza_bruta: int,
+) -> list[dict]:
+    rows = []
+    for archivo in archivos:
+        with open(archivo, "r") as f:
+            datos = f.read(limite)
+        for nombre in finders:
+            n = min(len(datos), limite_fuerza_bruta) if nombre == "brute" else len(datos)
+            buscador = FINDERS[nombre](
+                datos[:n], tam_ventana_historia, tam_ventana_futura
+            )
+            inicio = time.perf_counter()
+            tokens, coincidencias = parse(buscador, n)
+            segundos = time.perf_counter() - inicio
+            rows.append(
+                {
+                    "file": os.path.basename(archivo),
+                    "finder": nombre,
+                    "symbols": n,
+                    "tokens": tokens,
+                    "matched": coincidencias / max(n, 1),
+                    "seconds": segundos,
+                    "MB/s": n / segundos / 1e6,
+                }
+            )
+    return rows
+
+
+def main(
+    history: int = 1 << 20,
+    lookahead: int = 258,
+    limit: int = 1 << 20,
+    brute_limit: int = 20_000,
+    finder: list[str] = list(FINDERS),
+) -> None:
+    import polars as pl
+
+    archivos = [
+        os.path.join(SAMPLES, "alice29.txt"),
+        os.path.join(SAMPLES, "chimpanzee-dna.txt"),
+    ]
+    rows = benchmark(archivos, history, lookahead, finder, limit, brute_limit)
+    print(pl.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    import typer
+
+    typer.run(main)
@@ -0,0 +1,73 @@
+from array import array
+from typing import Iterable
+
+from .token_format import decode_tokens
+
+# Markers `compresion_lz77` writes instead of a space or a newline
+MARCADORES = {"esp": " ", "SDL": "\n"}
+
+
+def lz77_expand(tripletas: Iterable[tuple], prefijo=b""):
+    """Rebuild the data from its LZ77 triples, after `prefijo`.
+
+    The output is preallocated (a bytearray, or an `array("w")` for text) and
+    every match is a slice copy. An `array` prefix of any other type code
+    gives an array of that type back, so placeholders wider than a byte can
+    stand for prefix positions. A match that runs into the bytes it produces
+    (offset < length) is copied in doubling steps: the period is copied once,
+    then the region already written, so a run costs O(log length) copies.
+    """
+    texto = isinstance(prefijo, str)
+    if texto:
+        tripletas = [(d, l, MARCADORES.get(c, c)) for d, l, c in tripletas]
+    else:
+        tripletas = list(tripletas)
+    total = len(prefijo) + sum(l + len(c) for _, l, c in tripletas)
+
+    if texto:
+        salida = array("w", prefijo)
+        salida += array("w", "\0") * (total - len(prefijo))
+    elif isinstance(prefijo, array):
+        salida = array(prefijo.typecode, prefijo)
+        salida += array(prefijo.typecode, [0]) * (total - len(prefijo))
+    else:
+        salida = bytearray(total)
+        salida[: len(prefijo)] = prefijo
+
+    p = len(prefijo)
+    for desplazamiento, longitud, siguiente in tripletas:
+        if longitud:
+            origen = p - desplazamiento
+            if desplazamiento >= longitud:
+                salida[p : p + longitud] = salida[origen : origen + longitud]
+                p += longitud
+            else:
+                fin = p + longitud
+                while p < fin:
+                    n = min(p - origen, fin - p)
+                    salida[p : p + n] = salida[origen : origen + n]
+                    p += n
+        if siguiente:
+            salida[p] = siguiente[0]
+            p += 1
+
+    if texto:
+        return salida.tounicode()
+    return salida if isinstance(prefijo, array) else bytes(salida)
+
+
+def decompress(payload: bytes):
+    """Expand a token stream written by `token_format.encode_tokens`."""
+    prefijo, tripletas = decode_tokens(payload)
+    return lz77_expand(tripletas, prefijo)
+
+
+def lz77_decompress(ruta_entrada: str, ruta_salida: str) -> None:
+    with open(ruta_entrada, "rb") as entrada:
+        datos = decompress(entrada.read())
+    if isinstance(datos, str):
+        with open(ruta_salida, "w", encoding="utf-8", newline="") as salida:
+            salida.write(datos)
+    else:
+        with open(ruta_salida, "wb") as salida:
+            salida.write(datos)
@@ -0,0 +1,307 @@
+import numpy as np
+
+from huffman.canonical import canonical_codewords, code_lengths
+from teoria_info.bitstream import (
+    WINDOW_BITS,
+    WINDOW_MASK,
+    PrefixDecoder,
+    pack_codewords,
+    read_varint,
+    write_varint,
+)
+
+from .decompress import lz77_expand
+from .lzss import lzss
+from .optimal import CostModel, optimal_parse
+
+MIN_MATCH = 3
+HISTORY = 1 << 15
+LOOKAHEAD = 258
+CHAIN_DEPTH = 128
+# Tokens per block; every block carries its own pair of Huffman tables
+BLOCK_TOKENS = 1 << 14
+
+# Literal/length alphabet: bytes, end of block, then the length buckets
+END_OF_BLOCK = 256
+LENGTH_BASE = 257
+LITLEN_SYMBOLS = LENGTH_BASE + 17
+DISTANCE_SYMBOLS = 33
+
+LITERALS = [bytes([i]) for i in range(256)]
+
+
+def buckets(values: np.ndarray) -> np.ndarray:
+    """log2 bucket of each value: 0 for 0, else its bit length.
+
+    Bucket b > 0 holds [2**(b-1), 2**b) and is followed by its b - 1 low
+    bits as extra bits.
+    """
+    return np.frexp(values.astype(np.float64))[1].astype(np.int64)
+
+
+def extra_bits(bucket: np.ndarray) -> np.ndarray:
+    return np.maximum(bucket - 1, 0)
+
+
+def write_lengths(lengths: np.ndarray) -> bytes:
+    """Code lengths, one byte each, with runs of zeros as 0 + varint(run)."""
+    out = bytearray()
+    i = 0
+    values = lengths.tolist()
+    while i < len(values):
+        if values[i]:
+            out.append(values[i])
+            i += 1
+        else:
+            j = i
+            while j < len(values) and values[j] == 0:
+                j += 1
+            out.append(0)
+            out += write_varint(j - i)
+            i = j
+    return bytes(out)
+
+
+def read_lengths(payload: bytes, offset: int, n: int) -> tuple[np.ndarray, int]:
+    lengths = np.zeros(n, dtype=np.int64)
+    i = 0
+    while i < n:
+        value = payload[offset]
+        offset += 1
+        if value:
+            lengths[i] = value
+            i += 1
+        else:
+            run, offset = read_varint(payload, offset)
+            i += run
+    return lengths, offset
+
+
+def token_arrays(tokens) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(literal byte, length, offset) columns of a list of LZSS tokens."""
+    literales, longitudes, desplazamientos = [], [], []
+    for desplazamiento, longitud, siguiente in tokens:
+        literales.append(siguiente[0] if not longitud else 0)
+        longitudes.append(longitud)
+        desplazamientos.append(desplazamiento)
+    return (
+        np.array(literales, dtype=np.int64),
+        np.array(longitudes, dtype=np.int64),
+        np.array(desplazamientos, dtype=np.int64),
+    )
+
+
+def token_symbols(
+    literales: np.ndarray, longitudes: np.ndarray, desplazamientos: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    match = longitudes > 0
+    litlen = np.where(
+        match, LENGTH_BASE + buckets(np.maximum(longitudes - MIN_MATCH, 0)), literales
+    )
+    distance = buckets(np.maximum(desplazamientos - 1, 0))
+    return litlen, np.where(match, distance, 0)
+
+
+def symbol_counts(litlen: np.ndarray, distance: np.ndarray, match: np.ndarray):
+    litlen_counts = np.bincount(litlen, minlength=LITLEN_SYMBOLS)
+    litlen_counts[END_OF_BLOCK] += 1
+    distance_counts = np.bincount(distance[match], minlength=DISTANCE_SYMBOLS)
+    return litlen_counts, distance_counts
+
+
+def encode_block(
+    literales: np.ndarray, longitudes: np.ndarray, desplazamientos: np.ndarray
+) -> bytes:
+    match = longitudes > 0
+    litlen, distance = token_symbols(literales, longitudes, desplazamientos)
+    litlen_counts, distance_counts = symbol_counts(litlen, distance, match)
+    litlen_lengths = code_lengths(litlen_counts)
+    distance_lengths = code_lengths(distance_counts)
+    litlen_codes = canonical_codewords(litlen_lengths)
+    distance_codes = canonical_codewords(distance_lengths)
+
+    # Four fields per token, empty (0 bits) where they do not apply
+    n = len(litlen)
+    values = np.zeros((n + 1, 4), dtype=np.uint64)
+    bits = np.zeros((n + 1, 4), dtype=np.int64)
+    values[:n, 0] = litlen_codes[litlen]
+    bits[:n, 0] = litlen_lengths[litlen]
+
+    length_value = np.maximum(longitudes - MIN_MATCH, 0)
+    length_extra = np.where(match, extra_bits(buckets(length_value)), 0)
+    values[:n, 1] = length_value & ((1 << length_extra) - 1)
+    bits[:n, 1] = length_extra
+
+    distance_value = np.maximum(desplazamientos - 1, 0)
+    distance_extra = np.where(match, extra_bits(distance), 0)
+    values[:n, 2] = np.where(match, distance_codes[distance], 0)
+    bits[:n, 2] = np.where(match, distance_lengths[distance], 0)
+    values[:n, 3] = distance_value & ((1 << distance_extra) - 1)
+    bits[:n, 3] = distance_extra
+
+    values[n, 0] = litlen_codes[END_OF_BLOCK]
+    bits[n, 0] = litlen_lengths[END_OF_BLOCK]
+
+    packed = pack_codewords(values.ravel(), bits.ravel())
+    return (
+        write_lengths(litlen_lengths)
+        + write_lengths(distance_lengths)
+        + write_varint(len(packed))
+        + packed
+    )
+
+
+def huffman_costs(tokens) -> CostModel:
+    """Bit costs from the Huffman lengths a parse of `tokens` would get."""
+    literales, longitudes, desplazamientos = token_arrays(tokens)
+    match = longitudes > 0
+    litlen, distance = token_symbols(literales, longitudes, desplazamientos)
+    litlen_counts, distance_counts = symbol_counts(litlen, distance, match)
+    litlen_lengths = code_lengths(litlen_counts)
+    distance_lengths = code_lengths(distance_counts)
+    # Symbols the first parse never used are priced as a longest code
+    litlen_lengths[litlen_lengths == 0] = litlen_lengths.max() + 1
+    distance_lengths[distance_lengths == 0] = distance_lengths.max() + 1
+
+    def bucket_cost(value: int, lengths: np.ndarray, base: int = 0) -> float:
+        bucket = value.bit_length()
+        return float(lengths[base + bucket]) + max(bucket - 1, 0)
+
+    return CostModel(
+        lambda c: float(litlen_lengths[c[0]]),
+        lambda longitud: bucket_cost(
+            max(longitud - MIN_MATCH, 0), litlen_lengths, LENGTH_BASE
+        ),
+        lambda desplazamiento: bucket_cost(desplazamiento - 1, distance_lengths),
+    )
+
+
+def encode(
+    data: bytes,
+    history: int = HISTORY,
+    lookahead: int = LOOKAHEAD,
+    chain_depth: int | None = CHAIN_DEPTH,
+    optimal: bool = False,
+    prefix: bytes = b"",
+) -> bytes:
+    """LZSS tokens entropy coded with per-block canonical Huffman tables.
+
+    Like Deflate: one table for literals, end of block and length buckets,
+    another for distance buckets, with the low bits of each length and
+    distance sent raw after its bucket. With `optimal`, a lazy parse prices
+    the tokens and `optimal_parse` reparses the data with those costs.
+    Matches can reach into `prefix`, which `decode` must be given back.
+    """
+    datos = prefix + data
+    tokens = list(
+        lzss(
+            datos,
+            history,
+            lookahead,
+            MIN_MATCH,
+            True,
+            "hash",
+            chain_depth,
+            desde=len(prefix),
+        )
+    )
+    if optimal and tokens:
+        tokens = list(
+            optimal_parse(
+                datos,
+                history,
+                lookahead,
+                MIN_MATCH,
+                chain_depth=chain_depth,
+                costs=huffman_costs(tokens),
+                desde=len(prefix),
+            )
+        )
+
+    return encode_parsed(tokens, len(data))
+
+
+def encode_parsed(tokens: list, size: int) -> bytes:
+    """Entropy code an LZSS parse of `size` bytes, `BLOCK_TOKENS` at a time."""
+    out = bytearray(write_varint(size))
+    literales, longitudes, desplazamientos = token_arrays(tokens)
+    for start in range(0, len(tokens), BLOCK_TOKENS):
+        block = slice(start, start + BLOCK_TOKENS)
+        out += encode_block(literales[block], longitudes[block], desplazamientos[block])
+    return bytes(out)
+
+
+def decode_block(payload: bytes, offset: int, tokens: list) -> int:
+    litlen_lengths, offset = read_lengths(payload, offset, LITLEN_SYMBOLS)
+    distance_lengths, offset = read_lengths(payload, offset, DISTANCE_SYMBOLS)
+    size, offset = read_varint(payload, offset)
+    data = payload[offset : offset + size] + bytes(8)
+
+    litlen_decoder = PrefixDecoder(
+        np.arange(LITLEN_SYMBOLS), canonical_codewords(litlen_lengths), litlen_lengths
+    )
+    distance_decoder = PrefixDecoder(
+        np.arange(DISTANCE_SYMBOLS),
+        canonical_codewords(distance_lengths),
+        distance_lengths,
+    )
+
+    def read(position: int) -> int:
+        byte = position >> 3
+        return (
+            int.from_bytes(data[byte : byte + 8], "big") >> (8 - (position & 7))
+        ) & WINDOW_MASK
+
+    def symbol(decoder: PrefixDecoder, window: int) -> tuple[int, int]:
+        length = decoder.table_length[window >> decoder.shift]
+        if length:
+            return decoder.table_symbol[window >> decoder.shift], length
+        return decoder.slow(window)
+
+    position = 0
+    vacio = b""
+    while True:
+        value, length = symbol(litlen_decoder, read(position))
+        position += length
+        if value < END_OF_BLOCK:
+            tokens.append((0, 0, LITERALS[value]))
+            continue
+        if value == END_OF_BLOCK:
+            return offset + size
+
+        window = read(position)
+        bucket = value - LENGTH_BASE
+        extra = max(bucket - 1, 0)
+        longitud = (1 << extra if bucket else 0) + (
+            window >> (WINDOW_BITS - extra) if extra else 0
+        )
+        position += extra
+
+        window = read(position)
+        bucket, length = symbol(distance_decoder, window)
+        position += length
+        extra = max(bucket - 1, 0)
+        window = read(position)
+        desplazamiento = (1 << extra if bucket else 0) + (
+            window >> (WINDOW_BITS - extra) if extra else 0
+        )
+        position += extra
+
+        tokens.append((desplazamiento + 1, longitud + MIN_MATCH, vacio))
+
+
+def decode_tokens(payload: bytes) -> tuple[int, list]:
+    """Entropy decoding only: the data size and its LZSS tokens."""
+    total, offset = read_varint(payload, 0)
+    tokens: list = []
+    while offset < len(payload):
+        offset = decode_block(payload, offset, tokens)
+    return total, tokens
+
+
+def decode(payload: bytes, prefix: bytes = b"") -> bytes:
+    total, tokens = decode_tokens(payload)
+    data = lz77_expand(tokens, prefix)[len(prefix) :]
+    if len(data) != total:
+        raise ValueError("Corrupt deflate stream")
+    return data
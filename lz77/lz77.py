@@ -1,3 +1,9 @@
+import os
+
+from .match_finders import make_finder
+from .token_format import encode_tokens
+
+
 def digit_sum(num : int):
     result = 0
     num_str = str(num)
@@ -7,52 +13,46 @@ def digit_sum(num : int):
 
 
 def lz77(
-    ruta_archivo, tam_ventana_historia, tam_ventana_futura, archivo_salida
+    ruta_archivo,
+    tam_ventana_historia,
+    tam_ventana_futura,
+    archivo_salida,
+    match_finder: str = "hash",
+    chain_depth: int | None = None,
+    archivo_traza: str | None = None,
 ):
+    """Compress a text file and write its binary token stream to `archivo_salida`.
+
+    The first `tam_ventana_historia` symbols only seed the history window and
+    are stored raw ahead of the tokens (see `token_format.encode_tokens`).
+    The step by step trace with both windows is written to `archivo_traza`
+    only when it is given.
+    """
     with open(ruta_archivo, "r") as archivo:
         datos = archivo.read().lower().replace(" ", "").replace("\n", "")
 
+    buscador = make_finder(
+        datos, tam_ventana_historia, tam_ventana_futura, match_finder, chain_depth
+    )
+
     datos_comprimidos = []  # Almacena las tripletas
     posicion_actual = tam_ventana_historia
     paso = 1
 
-    with open(archivo_salida, "w") as salida:
+    traza = (
+        open(archivo_traza, "w", buffering=1 << 20) if archivo_traza else None
+    )
+    try:
         while posicion_actual < len(datos):
-            # Determina los límites de la ventana histórica y de la ventana de búsqueda futura
-            inicio_ventana = max(0, posicion_actual - tam_ventana_historia)
-            fin_ventana_futura = min(posicion_actual + tam_ventana_futura, len(datos))
-
-            # DefinE la ventana histórica y la ventana de búsqueda futura
-            ventana_historia = datos[inicio_ventana:posicion_actual]
-            ventana_futura = datos[posicion_actual:fin_ventana_futura]
-
-            # Inicializa las variables para el desplazamiento y la longitud de coincidencia máxima
-            longitud_coincidencia = 0
-            desplazamiento_coincidencia = 0
-            siguiente_caracter = ""
-
             # Busca la coincidencia más larga en la ventana de búsqueda
-            for i in range(len(ventana_historia)):
-                longitud = 0
-                while (
-                    i + longitud < len(ventana_historia)
-                    and longitud < len(ventana_futura)
-                    and ventana_historia[i + longitud] == ventana_futura[longitud]
-                ):
-                    longitud += 1
-
-                # Actualiza la coincidencia más larga encontrada
-                if longitud > longitud_coincidencia:
-                    longitud_coincidencia = longitud
-                    desplazamiento_coincidencia = len(ventana_historia) - i
-
-            # Determina el carácter siguiente y marcar espacio o salto de línea si corresponde
-            if longitud_coincidencia < len(ventana_futura):
-                siguiente_caracter = ventana_futura[longitud_coincidencia]
-                if siguiente_caracter == " ":
-                    siguiente_caracter = "esp"
-                elif siguiente_caracter == "\n":
-                    siguiente_caracter = "SDL"
+            desplazamiento_coincidencia, longitud_coincidencia = buscador.find(
+                posicion_actual
+            )
+
+            # Determina el carácter siguiente, vacío si la coincidencia llena la ventana futura
+            fin_ventana_futura = min(posicion_actual + tam_ventana_futura, len(datos))
+            if longitud_coincidencia < fin_ventana_futura - posicion_actual:
+                siguiente_caracter = datos[posicion_actual + longitud_coincidencia]
             else:
                 siguiente_caracter = ""
 
@@ -61,14 +61,21 @@ def lz77(
                 (desplazamiento_coincidencia, longitud_coincidencia, siguiente_caracter)
             )
 
-            # EscribE el paso y el estado de las ventanas en el archivo de salida
-            salida.write(f"Paso {paso}:\n")
-            salida.write(f"  Posición actual: {posicion_actual}\n")
-            salida.write(f"  Ventana histórica: ->{ventana_historia}<-\n")
-            salida.write(f"  Ventana futura: ->{ventana_futura}<-\n")
-            salida.write(
-                f"  Desplazamiento: {desplazamiento_coincidencia}, Longitud: {longitud_coincidencia}, Caracter: '{siguiente_caracter}'\n\n"
-            )
+            if traza:
+                # Escribe el paso y el estado de las ventanas en la traza
+                inicio_ventana = max(0, posicion_actual - tam_ventana_historia)
+                ventana_historia = datos[inicio_ventana:posicion_actual]
+                ventana_futura = datos[posicion_actual:fin_ventana_futura]
+                mostrado = {" ": "esp", "\n": "SDL"}.get(
+                    siguiente_caracter, siguiente_caracter
+                )
+                traza.write(
+                    f"Paso {paso}:\n"
+                    f"  Posición actual: {posicion_actual}\n"
+                    f"  Ventana histórica: ->{ventana_historia}<-\n"
+                    f"  Ventana futura: ->{ventana_futura}<-\n"
+                    f"  Desplazamiento: {desplazamiento_coincidencia}, Longitud: {longitud_coincidencia}, Caracter: '{mostrado}'\n\n"
+                )
 
             # Avanza A la posición actual
             posicion_actual += (
@@ -78,15 +85,26 @@ def lz77(
             )
             paso += 1  # Incrementar el paso
 
-        salida.write("Resultados finales de la compresión LZ77:\n")
-        for tripleta in datos_comprimidos:
-            salida.write(f"{tripleta}\n")
+        if traza:
+            traza.write("Resultados finales de la compresión LZ77:\n")
+            for tripleta in datos_comprimidos:
+                traza.write(f"{tripleta}\n")
+    finally:
+        if traza:
+            traza.close()
+
+    with open(archivo_salida, "wb") as salida:
+        salida.write(
+            encode_tokens(
+                datos_comprimidos, texto=True, prefijo=datos[:tam_ventana_historia]
+            )
+        )
 
     return datos_comprimidos
 
 
 def main():
-    text_route = "lyrics.txt"
+    text_route = os.path.join(os.path.dirname(__file__), "lyrics.txt")
 
     window_size = 38
 
@@ -97,11 +115,12 @@ def main():
     lookahead = window_size - history
     print(f"El tamaño de la ventana futura es: {lookahead}")
 
-    output = f"results{window_size}.txt"
+    output = f"results{window_size}.lz77"
+    trace = f"results{window_size}.txt"
 
-    lz77(text_route, history, lookahead, output)
+    lz77(text_route, history, lookahead, output, archivo_traza=trace)
 
-    print(f"Resultados guardados en {output}")
+    print(f"Resultados guardados en {output} (traza en {trace})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+from typing import Iterator
+
+from .match_finders import make_finder
+from .token_format import encode_tokens
+
+
+def lzss(
+    datos,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    min_match: int = 3,
+    lazy: bool = True,
+    match_finder: str = "hash",
+    chain_depth: int | None = None,
+    desde: int = 0,
+) -> Iterator[tuple]:
+    """LZSS parse of `datos`: literals `(0, 0, c)` and matches `(d, L, "")`.
+
+    Matches shorter than `min_match` are sent as literals, so no token pays
+    for a match and a character at once. With `lazy`, a match is deferred by
+    one literal when the next position has a longer one, as in gzip. The
+    parse starts at `desde`, so `datos[:desde]` only primes the window, and
+    the tokens rebuild `datos[desde:]` exactly.
+    """
+    buscador = make_finder(
+        datos, tam_ventana_historia, tam_ventana_futura, match_finder, chain_depth
+    )
+    vacio = datos[:0]
+    n = len(datos)
+    posicion = desde
+    siguiente = None
+    while posicion < n:
+        desplazamiento, longitud = siguiente or buscador.find(posicion)
+        siguiente = None
+        if longitud < min_match:
+            yield 0, 0, datos[posicion : posicion + 1]
+            posicion += 1
+            continue
+
+        if lazy and longitud < tam_ventana_futura and posicion + 1 < n:
+            siguiente = buscador.find(posicion + 1)
+            if siguiente[1] > longitud:
+                yield 0, 0, datos[posicion : posicion + 1]
+                posicion += 1
+                continue
+            siguiente = None
+
+        yield desplazamiento, longitud, vacio
+        posicion += longitud
+
+
+def lzss_file(
+    ruta_archivo: str,
+    archivo_salida: str,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    min_match: int = 3,
+    lazy: bool = True,
+    match_finder: str = "hash",
+    chain_depth: int | None = None,
+) -> int:
+    """Compress a file with `lzss` into the binary token format; returns the token count."""
+    with open(ruta_archivo, "rb") as archivo:
+        datos = archivo.read()
+    tokens = list(
+        lzss(
+            datos,
+            tam_ventana_historia,
+            tam_ventana_futura,
+            min_match,
+            lazy,
+            match_finder,
+            chain_depth,
+        )
+    )
+    with open(archivo_salida, "wb") as salida:
+        salida.write(encode_tokens(tokens))
+    return len(tokens)
@@ -0,0 +1,329 @@
+from array import array
+
+# Shortest match indexed by the hash chains
+MIN_CHAIN_MATCH = 3
+
+
+def match_length(datos, a: int, b: int, limite: int) -> int:
+    """Length of the common prefix of datos[a:] and datos[b:], up to `limite`."""
+    longitud = 0
+    corto = min(limite, 8)
+    while longitud < corto and datos[a + longitud] == datos[b + longitud]:
+        longitud += 1
+    if longitud < corto:
+        return longitud
+    while (
+        longitud + 16 <= limite
+        and datos[a + longitud : a + longitud + 16]
+        == datos[b + longitud : b + longitud + 16]
+    ):
+        longitud += 16
+    while longitud < limite and datos[a + longitud] == datos[b + longitud]:
+        longitud += 1
+    return longitud
+
+
+class BruteForceFinder:
+    """Tries every offset of the history window, as the original lz77 loop did."""
+
+    def __init__(self, datos, tam_ventana_historia: int, tam_ventana_futura: int):
+        self.datos = datos
+        self.tam_ventana_historia = tam_ventana_historia
+        self.tam_ventana_futura = tam_ventana_futura
+
+    def find(self, posicion: int) -> tuple[int, int]:
+        datos = self.datos
+        inicio = max(0, posicion - self.tam_ventana_historia)
+        maximo = min(self.tam_ventana_futura, len(datos) - posicion)
+
+        longitud_coincidencia = 0
+        desplazamiento_coincidencia = 0
+        for i in range(inicio, posicion):
+            longitud = match_length(datos, i, posicion, min(maximo, posicion - i))
+            if longitud > longitud_coincidencia:
+                longitud_coincidencia = longitud
+                desplazamiento_coincidencia = posicion - i
+        return desplazamiento_coincidencia, longitud_coincidencia
+
+
+class HashChainFinder:
+    """Longest match through hash chains over the next 3 symbols.
+
+    `head` maps each 3-gram to its latest position and `prev` links every
+    position to the previous one with the same 3-gram, kept in a cyclic buffer
+    the size of the window. Matches of 1 or 2 symbols are looked up with `find`
+    over the window. Ties go to the oldest position, so with `chain_depth=None`
+    (walk the whole chain) the result is the same as `BruteForceFinder`; a finite
+    depth trades that for speed on long windows.
+    """
+
+    def __init__(
+        self,
+        datos,
+        tam_ventana_historia: int,
+        tam_ventana_futura: int,
+        chain_depth: int | None = None,
+    ):
+        self.datos = datos
+        self.tam_ventana_historia = tam_ventana_historia
+        self.tam_ventana_futura = tam_ventana_futura
+        self.chain_depth = chain_depth
+        self.head: dict = {}
+        self.prev = array("q", [-1]) * max(tam_ventana_historia, 1)
+        # Next position whose 3-gram goes into the chains
+        self.cursor = 0
+
+    def _index_until(self, posicion: int) -> None:
+        """Chain every 3-gram that lies entirely before `posicion`."""
+        datos = self.datos
+        head = self.head
+        prev = self.prev
+        size = len(prev)
+        for c in range(self.cursor, posicion - MIN_CHAIN_MATCH + 1):
+            gram = datos[c : c + MIN_CHAIN_MATCH]
+            prev[c % size] = head.get(gram, -1)
+            head[gram] = c
+        self.cursor = max(self.cursor, posicion - MIN_CHAIN_MATCH + 1)
+
+    def find(self, posicion: int) -> tuple[int, int]:
+        self._index_until(posicion)
+        datos = self.datos
+        inicio = max(0, posicion - self.tam_ventana_historia)
+        maximo = min(self.tam_ventana_futura, len(datos) - posicion)
+
+        mejor_longitud = 0
+        mejor_posicion = -1
+        if maximo >= MIN_CHAIN_MATCH:
+            prev = self.prev
+            size = len(prev)
+            profundidad = self.chain_depth
+            candidato = self.head.get(datos[posicion : posicion + MIN_CHAIN_MATCH], -1)
+            while candidato >= inicio and profundidad != 0:
+                limite = min(maximo, posicion - candidato)
+                # Only candidates that can reach the best length are extended
+                if limite >= mejor_longitud and (
+                    mejor_longitud == 0
+                    or datos[candidato + mejor_longitud - 1]
+                    == datos[posicion + mejor_longitud - 1]
+                ):
+                    longitud = match_length(datos, candidato, posicion, limite)
+                    if longitud >= max(mejor_longitud, MIN_CHAIN_MATCH):
+                        mejor_longitud = longitud
+                        mejor_posicion = candidato
+                candidato = prev[candidato % size]
+                if profundidad is not None:
+                    profundidad -= 1
+
+        if mejor_longitud < MIN_CHAIN_MATCH:
+            # Oldest occurrence of the next 2 (or 1) symbols inside the window
+            for k in (2, 1):
+                if maximo >= k:
+                    mejor_posicion = datos.find(
+                        datos[posicion : posicion + k], inicio, posicion
+                    )
+                    if mejor_posicion >= 0:
+                        mejor_longitud = k
+                        break
+
+        if mejor_longitud == 0:
+            return 0, 0
+        return posicion - mejor_posicion, mejor_longitud
+
+    def candidates(
+        self, posicion: int, min_match: int = MIN_CHAIN_MATCH
+    ) -> list[tuple[int, int]]:
+        """Every useful match at `posicion`, as `(offset, length)` by increasing length.
+
+        Each entry is the closest position reaching its length, so the list
+        is the staircase of the cheapest offset for every length: a match of
+        any length up to `length` can use that entry's offset.
+        """
+        self._index_until(posicion)
+        datos = self.datos
+        inicio = max(0, posicion - self.tam_ventana_historia)
+        maximo = min(self.tam_ventana_futura, len(datos) - posicion)
+
+        escalera = []
+        mejor_longitud = min_match - 1
+        # Shortest matches, newest first, below the hash chains' 3 symbols
+        for k in range(max(min_match, 1), min(MIN_CHAIN_MATCH, maximo + 1)):
+            c = datos.rfind(datos[posicion : posicion + k], inicio, posicion)
+            if c < 0:
+                break
+            longitud = k + match_length(
+                datos, c + k, posicion + k, min(maximo, posicion - c) - k
+            )
+            if longitud > mejor_longitud:
+                escalera.append((posicion - c, longitud))
+                mejor_longitud = longitud
+
+        if maximo >= MIN_CHAIN_MATCH:
+            prev = self.prev
+            size = len(prev)
+            profundidad = self.chain_depth
+            candidato = self.head.get(datos[posicion : posicion + MIN_CHAIN_MATCH], -1)
+            while candidato >= inicio and profundidad != 0:
+                limite = min(maximo, posicion - candidato)
+                if limite > mejor_longitud and (
+                    mejor_longitud < MIN_CHAIN_MATCH
+                    or datos[candidato + mejor_longitud]
+                    == datos[posicion + mejor_longitud]
+                ):
+                    longitud = match_length(datos, candidato, posicion, limite)
+                    if longitud > mejor_longitud:
+                        escalera.append((posicion - candidato, longitud))
+                        mejor_longitud = longitud
+                        if longitud == maximo:
+                            break
+                candidato = prev[candidato % size]
+                if profundidad is not None:
+                    profundidad -= 1
+        return escalera
+
+
+class BinaryTreeFinder:
+    """Longest match from binary search trees of the window's suffixes.
+
+    Works like the LZMA "bt" finders: each 3-gram roots a tree of the
+    positions that start with it, ordered by their next `tam_ventana_futura`
+    symbols. Every new position is inserted at the root, splitting the old
+    tree, so parents are always newer than their children and a node outside
+    the window cuts off its whole subtree. The longest match is the closest
+    neighbour of the key in suffix order, so it lies on the search path and
+    each lookup costs O(log W) amortized.
+
+    Positions enter the tree `tam_ventana_futura` symbols late, where a match
+    can no longer run into the current position. The most recent positions,
+    and matches shorter than 3 symbols, are searched with `find`. Lengths
+    always match `BruteForceFinder`; on ties the offset can be a newer one.
+    """
+
+    def __init__(self, datos, tam_ventana_historia: int, tam_ventana_futura: int):
+        self.datos = datos
+        self.tam_ventana_historia = tam_ventana_historia
+        self.tam_ventana_futura = tam_ventana_futura
+        size = max(tam_ventana_historia, 1) + 1
+        self.left = array("i", [-1]) * size
+        self.right = array("i", [-1]) * size
+        self.roots: dict = {}
+        self.cursor = 0
+
+    def _insert(self, c: int, inicio: int) -> None:
+        datos = self.datos
+        left, right = self.left, self.right
+        size = len(left)
+        limite = min(self.tam_ventana_futura, len(datos) - c)
+        gram = datos[c : c + MIN_CHAIN_MATCH]
+        actual = self.roots.get(gram, -1)
+        self.roots[gram] = c
+
+        # Pending links: where the next smaller/larger node has to hang
+        menor, menor_idx = left, c % size
+        mayor, mayor_idx = right, c % size
+        len_menor = len_mayor = MIN_CHAIN_MATCH
+        while actual >= inicio:
+            longitud = min(len_menor, len_mayor)
+            longitud += match_length(
+                datos, actual + longitud, c + longitud, limite - longitud
+            )
+            slot = actual % size
+            if longitud == limite:
+                # Same key: the new node takes over the old one's subtrees
+                menor[menor_idx] = left[slot]
+                mayor[mayor_idx] = right[slot]
+                return
+            if datos[actual + longitud] < datos[c + longitud]:
+                menor[menor_idx] = actual
+                menor, menor_idx = right, slot
+                len_menor = longitud
+                actual = right[slot]
+            else:
+                mayor[mayor_idx] = actual
+                mayor, mayor_idx = left, slot
+                len_mayor = longitud
+                actual = left[slot]
+        menor[menor_idx] = -1
+        mayor[mayor_idx] = -1
+
+    def _search(self, posicion: int, inicio: int, maximo: int) -> tuple[int, int]:
+        datos = self.datos
+        left, right = self.left, self.right
+        size = len(left)
+        actual = self.roots.get(datos[posicion : posicion + MIN_CHAIN_MATCH], -1)
+        mejor_longitud, mejor_posicion = 0, -1
+        len_menor = len_mayor = MIN_CHAIN_MATCH
+        while actual >= inicio:
+            longitud = min(len_menor, len_mayor)
+            longitud += match_length(
+                datos, actual + longitud, posicion + longitud, maximo - longitud
+            )
+            if longitud > mejor_longitud:
+                mejor_longitud, mejor_posicion = longitud, actual
+            if longitud == maximo:
+                break
+            if datos[actual + longitud] < datos[posicion + longitud]:
+                len_menor = longitud
+                actual = right[actual % size]
+            else:
+                len_mayor = longitud
+                actual = left[actual % size]
+        return mejor_longitud, mejor_posicion
+
+    def find(self, posicion: int) -> tuple[int, int]:
+        datos = self.datos
+        inicio = max(0, posicion - self.tam_ventana_historia)
+        maximo = min(self.tam_ventana_futura, len(datos) - posicion)
+
+        if self.tam_ventana_futura >= MIN_CHAIN_MATCH:
+            for c in range(self.cursor, posicion - self.tam_ventana_futura + 1):
+                if c >= inicio and c + MIN_CHAIN_MATCH <= len(datos):
+                    self._insert(c, inicio)
+        self.cursor = max(self.cursor, posicion - self.tam_ventana_futura + 1)
+
+        mejor_longitud, mejor_posicion = 0, -1
+        if maximo >= MIN_CHAIN_MATCH:
+            mejor_longitud, mejor_posicion = self._search(posicion, inicio, maximo)
+
+        # Positions too recent for the tree, or anywhere for short matches. Each
+        # hit is the oldest occurrence of one more symbol than the best so far.
+        desde = inicio
+        if mejor_longitud >= MIN_CHAIN_MATCH:
+            desde = max(inicio, posicion - self.tam_ventana_futura + 1)
+        while mejor_longitud < maximo:
+            c = datos.find(
+                datos[posicion : posicion + mejor_longitud + 1], desde, posicion
+            )
+            if c < 0:
+                break
+            mejor_posicion = c
+            mejor_longitud += 1 + match_length(
+                datos,
+                c + mejor_longitud + 1,
+                posicion + mejor_longitud + 1,
+                min(maximo, posicion - c) - mejor_longitud - 1,
+            )
+
+        if mejor_longitud == 0:
+            return 0, 0
+        return posicion - mejor_posicion, mejor_longitud
+
+
+FINDERS = {
+    "brute": BruteForceFinder,
+    "hash": HashChainFinder,
+    "tree": BinaryTreeFinder,
+}
+
+
+def make_finder(
+    datos,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    match_finder: str = "hash",
+    chain_depth: int | None = None,
+):
+    if match_finder == "hash":
+        return HashChainFinder(
+            datos, tam_ventana_historia, tam_ventana_futura, chain_depth
+        )
+    return FINDERS[match_finder](datos, tam_ventana_historia, tam_ventana_futura)
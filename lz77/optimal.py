@@ -0,0 +1,137 @@
+from typing import Callable, Iterator, NamedTuple
+
+import numpy as np
+
+from teoria_info.bitstream import write_varint
+
+from .match_finders import MIN_CHAIN_MATCH, HashChainFinder
+from .token_format import encode_tokens
+
+
+class CostModel(NamedTuple):
+    """Bit cost of each token; a match costs `length(L) + distance(d)`."""
+
+    literal: Callable[[object], float]
+    length: Callable[[int], float]
+    distance: Callable[[int], float]
+
+
+def token_format_costs(texto: bool = False) -> CostModel:
+    """Exact costs of `token_format.encode_tokens`, flag bit included."""
+
+    def literal(c) -> float:
+        return 1 + 8 * (len(c.encode("utf-8")) if texto else len(c))
+
+    def length(longitud: int) -> float:
+        return 8 * len(write_varint(longitud))
+
+    def distance(desplazamiento: int) -> float:
+        return 1 + 8 * len(write_varint(desplazamiento << 1))
+
+    return CostModel(literal, length, distance)
+
+
+def optimal_parse(
+    datos,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    min_match: int = MIN_CHAIN_MATCH,
+    block_size: int = 1 << 16,
+    chain_depth: int | None = 128,
+    costs: CostModel | None = None,
+    desde: int = 0,
+) -> Iterator[tuple]:
+    """Cheapest parse of `datos` under `costs`, one block at a time.
+
+    Every position gets its staircase of candidate matches (the closest
+    offset for each reachable length, see `HashChainFinder.candidates`) and
+    a shortest path over the positions of the block picks the tokens: a
+    literal edge to the next position and, for every candidate, one edge per
+    length. The cost of all the lengths of a candidate is relaxed at once
+    with NumPy. Matches may reference earlier blocks but stop at the block
+    end, so memory is linear in `block_size`. Tokens are the same as `lzss`,
+    including the window priming with `datos[:desde]`.
+    """
+    costs = costs or token_format_costs(isinstance(datos, str))
+    buscador = HashChainFinder(
+        datos, tam_ventana_historia, tam_ventana_futura, chain_depth
+    )
+    costo_longitud = np.array(
+        [costs.length(longitud) for longitud in range(tam_ventana_futura + 1)]
+    )
+    costo_distancia: dict[int, float] = {}
+    vacio = datos[:0]
+    n = len(datos)
+
+    for inicio in range(desde, n, block_size):
+        m = min(block_size, n - inicio)
+        costo = np.full(m + 1, np.inf)
+        costo[0] = 0.0
+        longitudes = np.zeros(m + 1, dtype=np.int64)
+        desplazamientos = np.zeros(m + 1, dtype=np.int64)
+
+        for p in range(m):
+            actual = costo[p]
+            literal = actual + costs.literal(datos[inicio + p : inicio + p + 1])
+            if literal < costo[p + 1]:
+                costo[p + 1] = literal
+                longitudes[p + 1] = 0
+
+            anterior = min_match - 1
+            for desplazamiento, longitud in buscador.candidates(inicio + p, min_match):
+                minima = anterior + 1
+                maxima = min(longitud, m - p)
+                anterior = longitud
+                if minima > maxima:
+                    continue
+                base = costo_distancia.get(desplazamiento)
+                if base is None:
+                    base = costo_distancia[desplazamiento] = costs.distance(
+                        desplazamiento
+                    )
+                nuevo = actual + base + costo_longitud[minima : maxima + 1]
+                mejora = np.flatnonzero(nuevo < costo[p + minima : p + maxima + 1])
+                if len(mejora):
+                    destino = p + minima + mejora
+                    costo[destino] = nuevo[mejora]
+                    longitudes[destino] = minima + mejora
+                    desplazamientos[destino] = desplazamiento
+
+        tokens = []
+        q = m
+        while q > 0:
+            longitud = int(longitudes[q])
+            if longitud == 0:
+                tokens.append((0, 0, datos[inicio + q - 1 : inicio + q]))
+                q -= 1
+            else:
+                tokens.append((int(desplazamientos[q]), longitud, vacio))
+                q -= longitud
+        yield from reversed(tokens)
+
+
+def optimal_file(
+    ruta_archivo: str,
+    archivo_salida: str,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    min_match: int = MIN_CHAIN_MATCH,
+    block_size: int = 1 << 16,
+    chain_depth: int | None = 128,
+) -> int:
+    """Compress a file with `optimal_parse` into the binary token format; returns the token count."""
+    with open(ruta_archivo, "rb") as archivo:
+        datos = archivo.read()
+    tokens = list(
+        optimal_parse(
+            datos,
+            tam_ventana_historia,
+            tam_ventana_futura,
+            min_match,
+            block_size,
+            chain_depth,
+        )
+    )
+    with open(archivo_salida, "wb") as salida:
+        salida.write(encode_tokens(tokens))
+    return len(tokens)
@@ -0,0 +1,152 @@
+import os
+import struct
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO, Callable, Iterable
+
+import numpy as np
+
+from teoria_info.bitstream import read_varint, write_varint
+
+from . import deflate
+from .decompress import lz77_expand
+
+MAGIC = b"TLZP"
+# Little-endian offset of the block index, the last 8 bytes of the file
+FOOTER = struct.Struct("<Q")
+
+
+def _compress_block(args: tuple[bytes, bytes, bool]) -> bytes:
+    prefix, block, optimal = args
+    return deflate.encode(block, optimal=optimal, prefix=prefix)
+
+
+def compress_parallel(
+    src: BinaryIO,
+    dst: BinaryIO,
+    block_size: int = 1 << 20,
+    prime: int = deflate.HISTORY,
+    optimal: bool = False,
+    workers: int | None = None,
+) -> int:
+    """Compress `src` in independent blocks across a process pool.
+
+    Each block is coded with `deflate`, with the last `prime` bytes of the
+    previous block as its starting window, so matches across block borders
+    are not lost. Layout: the magic, varint(prime), the payloads, then the
+    index (varint block count and a raw size / payload size pair per block)
+    and the 8 byte offset of that index. Returns the number of blocks.
+    """
+    dst.write(MAGIC + write_varint(prime))
+
+    def jobs():
+        tail = b""
+        while block := src.read(block_size):
+            yield tail, block, optimal
+            tail = block[-prime:] if prime else b""
+
+    sizes = []
+    with ProcessPoolExecutor(workers) as pool:
+        for (_, block, _), payload in _ordered(
+            pool, _compress_block, jobs(), workers
+        ):
+            dst.write(payload)
+            sizes.append((len(block), len(payload)))
+
+    index = bytearray(write_varint(len(sizes)))
+    for raw, packed in sizes:
+        index += write_varint(raw) + write_varint(packed)
+    position = dst.tell()
+    dst.write(bytes(index) + FOOTER.pack(position))
+    return len(sizes)
+
+
+def _ordered(pool: Executor, fn: Callable, jobs: Iterable, workers: int | None):
+    """(job, fn(job)) for every job, in order, with a bounded number in flight."""
+    limit = 2 * (workers or os.cpu_count() or 1)
+    pending = []
+    for job in jobs:
+        pending.append((job, pool.submit(fn, job)))
+        if len(pending) >= limit:
+            job, future = pending.pop(0)
+            yield job, future.result()
+    for job, future in pending:
+        yield job, future.result()
+
+
+def read_index(src: BinaryIO) -> tuple[int, list[tuple[int, int, int]]]:
+    """Prime size and (offset, raw size, payload size) of every block."""
+    if src.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a parallel LZ77 container")
+    header = src.read(10)
+    prime, used = read_varint(header, 0)
+    offset = len(MAGIC) + used
+
+    src.seek(-FOOTER.size, 2)
+    end = src.tell()
+    (position,) = FOOTER.unpack(src.read(FOOTER.size))
+    src.seek(position)
+    index = src.read(end - position)
+    count, i = read_varint(index, 0)
+    blocks = []
+    for _ in range(count):
+        raw, i = read_varint(index, i)
+        packed, i = read_varint(index, i)
+        blocks.append((offset, raw, packed))
+        offset += packed
+    return prime, blocks
+
+
+def _decode_block(args: tuple[bytes, int]) -> tuple[int, bytes, np.ndarray, np.ndarray]:
+    """Decode and expand one block before the previous block's tail is known.
+
+    The tail is stood in for by placeholders 256 + i in a uint32 buffer, so
+    the expansion runs here in full. Returns the block size, its bytes (0
+    where a placeholder landed), and the positions of the placeholders with
+    the tail index each one stands for.
+    """
+    payload, cola = args
+    total, tokens = deflate.decode_tokens(payload)
+    salida = lz77_expand(tokens, array("I", range(256, 256 + cola)))
+    valores = np.frombuffer(salida, dtype=f"u{salida.itemsize}")[cola:]
+    huecos = np.flatnonzero(valores >= 256)
+    return (
+        total,
+        valores.astype(np.uint8).tobytes(),
+        huecos.astype(np.uint32),
+        (valores[huecos] - 256).astype(np.uint32),
+    )
+
+
+def decompress_parallel(
+    src: BinaryIO, dst: BinaryIO, workers: int | None = None
+) -> None:
+    """Inverse of `compress_parallel`.
+
+    Workers Huffman decode and expand whole blocks, sending back bytes
+    rather than token lists. Bytes copied from the previous block's tail are
+    left as placeholders. Here, in order, they are filled in with one NumPy
+    gather per block, which is the only sequential work.
+    """
+    prime, blocks = read_index(src)
+
+    def jobs():
+        previous = 0
+        for offset, raw, packed in blocks:
+            src.seek(offset)
+            yield src.read(packed), min(prime, previous)
+            previous = raw
+
+    tail = np.zeros(0, dtype=np.uint8)
+    with ProcessPoolExecutor(workers) as pool:
+        for (_, raw, _), (_, (total, data, holes, sources)) in zip(
+            blocks, _ordered(pool, _decode_block, jobs(), workers)
+        ):
+            block = np.frombuffer(data, dtype=np.uint8)
+            if len(holes):
+                block = block.copy()
+                block[holes] = tail[sources]
+            if len(block) != raw or total != raw:
+                raise ValueError("Corrupt block")
+            dst.write(block.tobytes() if len(holes) else data)
+            tail = block[len(block) - min(prime, len(block)) :]
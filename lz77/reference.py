@@ -0,0 +1,249 @@
+import mmap
+import os
+from typing import Iterator
+
+import numpy as np
+
+from . import deflate
+from .match_finders import HashChainFinder
+
+# Multiplier of the polynomial k-gram hash (mod 2**64)
+HASH_BASE = np.uint64(0x100000001B3)
+# Longest match and farthest offset the deflate length/distance buckets hold
+MAX_MATCH = (
+    deflate.MIN_MATCH + (1 << (deflate.LITLEN_SYMBOLS - deflate.LENGTH_BASE - 1)) - 1
+)
+MAX_DISTANCE = 1 << (deflate.DISTANCE_SYMBOLS - 1)
+
+
+def kgram_hashes(datos: np.ndarray, k: int, paso: int = 1) -> np.ndarray:
+    """Hash of the k-grams of a uint8 array starting at every `paso` offsets."""
+    n = len(datos) - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.uint64)
+    hashes = np.zeros(-(-n // paso), dtype=np.uint64)
+    for j in range(k):
+        hashes = hashes * HASH_BASE + datos[j : j + n : paso].astype(np.uint64)
+    return hashes
+
+
+def map_reference(ruta: str):
+    """Read-only mmap of a reference file (b"" when it is empty)."""
+    with open(ruta, "rb") as archivo:
+        if not os.fstat(archivo.fileno()).st_size:
+            return b""
+        return mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def common_length(a, i: int, b, j: int, limite: int) -> int:
+    """Length of the common prefix of a[i:] and b[j:], up to `limite`."""
+    longitud = 0
+    paso = 64
+    while longitud < limite:
+        n = min(paso, limite - longitud)
+        if a[i + longitud : i + longitud + n] == b[j + longitud : j + longitud + n]:
+            longitud += n
+            paso *= 2
+        elif n == 1:
+            break
+        else:
+            paso = max(n // 2, 1)
+    return longitud
+
+
+class ReferenceIndex:
+    """A memory-mapped reference file and the sorted hashes of sampled k-grams.
+
+    Only the k-grams starting at multiples of `paso` (k // 2) are indexed: a
+    match of at least k + paso - 1 bytes always covers one of them. The
+    hashes (sorted uint64) and their positions (uint32) are saved as `.npy`
+    files under the `cache` stem, next to the reference by default, and are
+    memory-mapped back while the reference keeps the same size and
+    modification time. A cache that cannot be written is only skipped.
+    """
+
+    def __init__(self, ruta: str, k: int = 16, cache: str | None = None):
+        self.ruta = ruta
+        self.k = k
+        self.paso = max(k // 2, 1)
+        self.cache = cache or f"{ruta}.k{k}"
+        self.datos = map_reference(ruta)
+        if len(self.datos) >= 1 << 32:
+            raise ValueError("References are limited to 4 GiB")
+        self.hashes, self.posiciones = self._load_or_build()
+
+    def __len__(self) -> int:
+        return len(self.datos)
+
+    def _firma(self) -> np.ndarray:
+        stat = os.stat(self.ruta)
+        return np.array([stat.st_size, stat.st_mtime_ns, self.k], dtype=np.int64)
+
+    def _load_or_build(self) -> tuple[np.ndarray, np.ndarray]:
+        firma = self._firma()
+        ruta_firma, ruta_hashes, ruta_posiciones = (
+            f"{self.cache}.{nombre}.npy" for nombre in ("firma", "hashes", "posiciones")
+        )
+        try:
+            if np.array_equal(np.load(ruta_firma), firma):
+                return (
+                    np.load(ruta_hashes, mmap_mode="r"),
+                    np.load(ruta_posiciones, mmap_mode="r"),
+                )
+        except (OSError, ValueError):
+            pass
+
+        hashes = kgram_hashes(
+            np.frombuffer(self.datos, dtype=np.uint8), self.k, self.paso
+        )
+        orden = np.argsort(hashes, kind="stable")
+        hashes = hashes[orden]
+        posiciones = (orden * self.paso).astype(np.uint32)
+        try:
+            np.save(ruta_hashes, hashes)
+            np.save(ruta_posiciones, posiciones)
+            # Written last, so an interrupted save is never taken as valid
+            np.save(ruta_firma, firma)
+        except OSError:
+            pass
+        return hashes, posiciones
+
+    def lookup(self, hashes: np.ndarray) -> np.ndarray:
+        """First index of every hash in the sorted table, -1 where it is absent."""
+        if len(self.hashes) == 0:
+            return np.full(len(hashes), -1, dtype=np.int64)
+        primero = np.searchsorted(self.hashes, hashes)
+        presente = self.hashes[np.minimum(primero, len(self.hashes) - 1)] == hashes
+        return np.where(presente, primero, -1)
+
+
+def delta_parse(
+    indice: ReferenceIndex,
+    datos: bytes,
+    tam_ventana_historia: int = deflate.HISTORY,
+    tam_ventana_futura: int = 1 << 16,
+    chain_depth: int | None = deflate.CHAIN_DEPTH,
+    max_candidates: int = 8,
+) -> Iterator[tuple]:
+    """Greedy LZSS parse of `datos` against the reference and its own history.
+
+    Offsets count back through the virtual concatenation reference + data,
+    so a match into the reference at `r` from position `p` has offset
+    `len(reference) + p - r` and `lz77_expand` with the reference as prefix
+    rebuilds the data. Reference matches are found through the k-gram index
+    (every data k-gram is looked up at once) and checked on the mmap. As the
+    index is sampled, a match from p is found through the data k-gram at
+    p + d that hits a sampled k-gram, for every d below the sampling step.
+    """
+    if tam_ventana_futura > MAX_MATCH:
+        raise ValueError(f"Lookahead is limited to {MAX_MATCH} bytes")
+    if len(indice) + len(datos) >= MAX_DISTANCE:
+        raise ValueError("Reference and data together are limited to 4 GiB")
+    k = indice.k
+    paso = indice.paso
+    referencia = indice.datos
+    tam_referencia = len(referencia)
+    buscador = HashChainFinder(
+        datos, tam_ventana_historia, tam_ventana_futura, chain_depth
+    )
+    primeros = indice.lookup(
+        kgram_hashes(np.frombuffer(datos, dtype=np.uint8), k)
+    ).tolist()
+    hashes = indice.hashes
+    posiciones = indice.posiciones
+    vacio = b""
+
+    n = len(datos)
+    p = 0
+    while p < n:
+        desplazamiento, longitud = buscador.find(p)
+        maximo = min(tam_ventana_futura, n - p)
+        for d in range(min(paso, len(primeros) - p)):
+            i = primeros[p + d]
+            if i < 0 or longitud == maximo:
+                continue
+            h = hashes[i]
+            for j in range(i, min(i + max_candidates, len(hashes))):
+                if hashes[j] != h:
+                    break
+                r = int(posiciones[j]) - d
+                if r < 0:
+                    continue
+                largo = common_length(
+                    referencia, r, datos, p, min(maximo, tam_referencia - r)
+                )
+                if largo > longitud:
+                    desplazamiento, longitud = tam_referencia + p - r, largo
+                    if largo == maximo:
+                        break
+
+        if longitud >= deflate.MIN_MATCH:
+            yield desplazamiento, longitud, vacio
+            p += longitud
+        else:
+            yield 0, 0, datos[p : p + 1]
+            p += 1
+
+
+def encode_delta(indice: ReferenceIndex, datos: bytes, **opciones) -> bytes:
+    """Deflate payload of `datos` with matches into the reference."""
+    tokens = list(delta_parse(indice, datos, **opciones))
+    return deflate.encode_parsed(tokens, len(datos))
+
+
+def expand_delta(tokens: list, referencia) -> bytearray:
+    """`lz77_expand` with `referencia` as prefix, without copying it.
+
+    A match reaching back past the start of the data is read straight from
+    the reference (an mmap or bytes), so only the matched ranges are touched.
+    """
+    tam_referencia = len(referencia)
+    salida = bytearray(sum(l + len(c) for _, l, c in tokens))
+    p = 0
+    for desplazamiento, longitud, siguiente in tokens:
+        if longitud:
+            origen = p - desplazamiento
+            if origen < 0:
+                n = min(longitud, -origen)
+                inicio = tam_referencia + origen
+                salida[p : p + n] = referencia[inicio : inicio + n]
+                p += n
+                longitud -= n
+                origen = 0
+            fin = p + longitud
+            while p < fin:
+                n = min(p - origen, fin - p)
+                salida[p : p + n] = salida[origen : origen + n]
+                p += n
+        if siguiente:
+            salida[p] = siguiente[0]
+            p += 1
+    return salida
+
+
+def decode_delta(referencia, payload: bytes) -> bytes:
+    """Data of a delta payload; `referencia` is the reference's bytes or mmap."""
+    total, tokens = deflate.decode_tokens(payload)
+    datos = expand_delta(tokens, referencia)
+    if len(datos) != total:
+        raise ValueError("Corrupt delta stream")
+    return bytes(datos)
+
+
+def delta_file(
+    ruta_referencia: str, ruta_entrada: str, ruta_salida: str, k: int = 16
+) -> None:
+    indice = ReferenceIndex(ruta_referencia, k)
+    with open(ruta_entrada, "rb") as entrada:
+        datos = entrada.read()
+    with open(ruta_salida, "wb") as salida:
+        salida.write(encode_delta(indice, datos))
+
+
+def undelta_file(ruta_referencia: str, ruta_entrada: str, ruta_salida: str) -> None:
+    """Decode against the reference file itself: no index is built or read."""
+    referencia = map_reference(ruta_referencia)
+    with open(ruta_entrada, "rb") as entrada:
+        payload = entrada.read()
+    with open(ruta_salida, "wb") as salida:
+        salida.write(decode_delta(referencia, payload))
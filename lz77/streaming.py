@@ -0,0 +1,158 @@
+from array import array
+from typing import BinaryIO, Iterator
+
+from .match_finders import MIN_CHAIN_MATCH, match_length
+
+# Multiplier of the Fibonacci hash that picks a 3-gram's head slot
+HASH_MULTIPLIER = 0x9E3779B1
+
+
+class VentanaCircular:
+    """Sliding window over a byte stream, kept in a mirrored ring buffer.
+
+    Every byte is stored twice, at `i % cap` and `i % cap + cap`, so any run
+    of up to `cap` consecutive stream positions is one contiguous slice of the
+    buffer and can be compared through a memoryview without copying.
+    """
+
+    def __init__(self, capacidad: int):
+        self.cap = capacidad
+        self.buf = bytearray(2 * capacidad)
+        self.vista = memoryview(self.buf)
+        # Stream position one past the last byte read
+        self.fin = 0
+
+    def escribir(self, bloque: bytes) -> None:
+        cap = self.cap
+        buf = self.buf
+        i = 0
+        while i < len(bloque):
+            r = self.fin % cap
+            n = min(len(bloque) - i, cap - r)
+            buf[r : r + n] = bloque[i : i + n]
+            buf[r + cap : r + cap + n] = bloque[i : i + n]
+            i += n
+            self.fin += n
+
+
+def lz77_stream(
+    archivo: BinaryIO,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    tam_bloque: int = 1 << 16,
+    chain_depth: int | None = None,
+) -> Iterator[tuple[int, int, bytes]]:
+    """Yield the LZ77 triples of a binary stream, reading it in fixed chunks.
+
+    Same triples as `lz77.lz77` with the hash chain finder: a match lies
+    inside the history window and cannot run into the current position, ties
+    go to the oldest occurrence, and the next byte is `b""` when the match
+    fills the lookahead. Unlike `lz77.lz77` the parse starts at position 0 and
+    the data is not rewritten, so the triples rebuild the stream exactly.
+    Memory stays at about `2 * (history + lookahead + chunk)` bytes for the
+    window plus 8 bytes per slot of the chain tables: `history` for `prev`
+    and the power of two at or above it for `head`. The head slot is a hash
+    of the 3-gram, so a chain can hold other 3-grams; `match_length` rejects
+    them.
+    """
+    H, F = tam_ventana_historia, tam_ventana_futura
+    ventana = VentanaCircular(H + F + tam_bloque)
+    vista = ventana.vista
+    buf = ventana.buf
+    cap = ventana.cap
+
+    prev = array("q", [-1]) * max(H, 1)
+    size = len(prev)
+    bits = max(size - 1, 1).bit_length()
+    head = array("q", [-1]) * (1 << bits)
+    desplazamiento_hash = 32 - bits
+    cursor = 0
+    fin_archivo = False
+    posicion = 0
+
+    while True:
+        while not fin_archivo and ventana.fin - posicion < F:
+            bloque = archivo.read(tam_bloque)
+            if bloque:
+                ventana.escribir(bloque)
+            else:
+                fin_archivo = True
+        if posicion >= ventana.fin:
+            return
+
+        inicio = max(0, posicion - H)
+        maximo = min(F, ventana.fin - posicion)
+        r = posicion % cap
+
+        # Chain every 3-gram that lies entirely before the current position
+        for c in range(max(cursor, inicio), posicion - MIN_CHAIN_MATCH + 1):
+            rc = c % cap
+            clave = (
+                ((buf[rc] << 16 | buf[rc + 1] << 8 | buf[rc + 2]) * HASH_MULTIPLIER)
+                & 0xFFFFFFFF
+            ) >> desplazamiento_hash
+            prev[c % size] = head[clave]
+            head[clave] = c
+        cursor = max(cursor, posicion - MIN_CHAIN_MATCH + 1)
+
+        mejor_longitud = 0
+        mejor_posicion = -1
+        if maximo >= MIN_CHAIN_MATCH:
+            profundidad = chain_depth
+            clave = (
+                ((buf[r] << 16 | buf[r + 1] << 8 | buf[r + 2]) * HASH_MULTIPLIER)
+                & 0xFFFFFFFF
+            ) >> desplazamiento_hash
+            candidato = head[clave]
+            while candidato >= inicio and profundidad != 0:
+                limite = min(maximo, posicion - candidato)
+                rc = candidato % cap
+                if limite >= mejor_longitud and (
+                    mejor_longitud == 0
+                    or buf[rc + mejor_longitud - 1] == buf[r + mejor_longitud - 1]
+                ):
+                    longitud = match_length(vista, rc, r, limite)
+                    if longitud >= max(mejor_longitud, MIN_CHAIN_MATCH):
+                        mejor_longitud = longitud
+                        mejor_posicion = candidato
+                candidato = prev[candidato % size]
+                if profundidad is not None:
+                    profundidad -= 1
+
+        if mejor_longitud < MIN_CHAIN_MATCH:
+            # Oldest occurrence of the next 2 (or 1) bytes inside the window
+            ri = inicio % cap
+            for k in (2, 1):
+                if maximo >= k:
+                    encontrado = buf.find(
+                        vista[r : r + k], ri, ri + posicion - inicio
+                    )
+                    if encontrado >= 0:
+                        mejor_longitud = k
+                        mejor_posicion = inicio + encontrado - ri
+                        break
+
+        if mejor_longitud < maximo:
+            siguiente = vista[r + mejor_longitud : r + mejor_longitud + 1].tobytes()
+        else:
+            siguiente = b""
+
+        if mejor_longitud == 0:
+            yield 0, 0, siguiente
+        else:
+            yield posicion - mejor_posicion, mejor_longitud, siguiente
+        posicion += mejor_longitud + len(siguiente)
+
+
+def lz77_stream_file(
+    ruta_archivo: str,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    tam_bloque: int = 1 << 16,
+    chain_depth: int | None = None,
+) -> Iterator[tuple[int, int, bytes]]:
+    with open(ruta_archivo, "rb") as archivo:
+        yield from lz77_stream(
+            archivo, tam_ventana_historia, tam_ventana_futura, tam_bloque, chain_depth
+        )
+
@@ -0,0 +1,97 @@
+from typing import Iterable
+
+from teoria_info.bitstream import read_varint, write_varint
+
+# First byte of a token stream: what the literal characters are
+MODO_BYTES = 0
+MODO_TEXTO = 1
+
+
+def _utf8_length(lead: int) -> int:
+    if lead < 0x80:
+        return 1
+    if lead < 0xE0:
+        return 2
+    if lead < 0xF0:
+        return 3
+    return 4
+
+
+def encode_tokens(
+    tripletas: Iterable[tuple], texto: bool = False, prefijo=None
+) -> bytes:
+    """Pack LZ77 triples into a compact binary token stream.
+
+    Layout: the mode byte, the varint length of `prefijo` (the symbols that
+    precede the first token, stored raw) and the prefix itself, then groups
+    of up to 8 tokens, each preceded by a byte of flags (bit i set when token
+    i is a match). A literal `(0, 0, c)` is just `c`; a match is
+    `varint(length)`, `varint(offset << 1 | has_char)` and then `c` if it has
+    one. A match of length 0 ends the stream. Characters are UTF-8 in text
+    mode and single bytes otherwise.
+    """
+    prefijo = prefijo if prefijo is not None else ("" if texto else b"")
+    crudo = prefijo.encode("utf-8") if texto else bytes(prefijo)
+
+    salida = bytearray([MODO_TEXTO if texto else MODO_BYTES])
+    salida += write_varint(len(crudo))
+    salida += crudo
+
+    flags = 0
+    n = 0
+    grupo = bytearray()
+    for desplazamiento, longitud, siguiente in tripletas:
+        caracter = siguiente.encode("utf-8") if texto else siguiente
+        if longitud == 0:
+            if not caracter:
+                raise ValueError("Empty literal token")
+            grupo += caracter
+        else:
+            flags |= 1 << n
+            grupo += write_varint(longitud)
+            grupo += write_varint(desplazamiento << 1 | (1 if caracter else 0))
+            grupo += caracter
+        n += 1
+        if n == 8:
+            salida.append(flags)
+            salida += grupo
+            flags, n = 0, 0
+            grupo.clear()
+
+    # End marker: a match token of length 0
+    salida.append(flags | 1 << n)
+    salida += grupo
+    salida += write_varint(0)
+    return bytes(salida)
+
+
+def decode_tokens(payload: bytes) -> tuple:
+    """Inverse of `encode_tokens`: returns `(prefijo, tripletas)`."""
+    texto = payload[0] == MODO_TEXTO
+    largo, offset = read_varint(payload, 1)
+    crudo = payload[offset : offset + largo]
+    offset += largo
+    prefijo = crudo.decode("utf-8") if texto else bytes(crudo)
+
+    tripletas = []
+    while True:
+        flags = payload[offset]
+        offset += 1
+        for i in range(8):
+            if flags >> i & 1:
+                longitud, offset = read_varint(payload, offset)
+                if longitud == 0:
+                    return prefijo, tripletas
+                campo, offset = read_varint(payload, offset)
+                desplazamiento = campo >> 1
+                if not campo & 1:
+                    tripletas.append((desplazamiento, longitud, prefijo[:0]))
+                    continue
+                tamano = _utf8_length(payload[offset]) if texto else 1
+            else:
+                desplazamiento = longitud = 0
+                tamano = _utf8_length(payload[offset]) if texto else 1
+            caracter = payload[offset : offset + tamano]
+            offset += tamano
+            siguiente = caracter.decode("utf-8") if texto else bytes(caracter)
+            tripletas.append((desplazamiento, longitud, siguiente))
@@ -0,0 +1,165 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .lzss import lzss
+from .match_finders import MIN_CHAIN_MATCH, HashChainFinder
+
+HISTORIES = [256, 1024, 4096, 16384, 32768]
+LOOKAHEADS = [8, 16, 32, 64, 258]
+
+# Candidate staircases shared by the configurations a worker evaluates
+_compartido: dict = {}
+
+
+def match_candidates(
+    datos: bytes,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    chain_depth: int | None = 256,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Staircase of candidate matches at every position, for the largest window.
+
+    Returns `(inicios, desplazamientos, longitudes)`: the entries of position
+    p are `inicios[p]:inicios[p + 1]`, by increasing offset and length. The
+    longest match of a smaller window H is the last entry with offset <= H,
+    cut to its lookahead, so one pass serves every configuration.
+    """
+    buscador = HashChainFinder(
+        datos, tam_ventana_historia, tam_ventana_futura, chain_depth
+    )
+    inicios = [0]
+    desplazamientos: list[int] = []
+    longitudes: list[int] = []
+    for posicion in range(len(datos)):
+        for desplazamiento, longitud in buscador.candidates(posicion):
+            desplazamientos.append(desplazamiento)
+            longitudes.append(longitud)
+        inicios.append(len(desplazamientos))
+    return (
+        np.array(inicios, dtype=np.int64),
+        np.array(desplazamientos, dtype=np.int64),
+        np.array(longitudes, dtype=np.int64),
+    )
+
+
+def _varint_bits(value: int) -> int:
+    return 8 * max(1, (value.bit_length() + 6) // 7)
+
+
+def parse_cost(
+    inicios: list[int],
+    desplazamientos: list[int],
+    longitudes: list[int],
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+) -> tuple[int, int]:
+    """Greedy LZSS parse from the staircases: (tokens, bits in the token format)."""
+    n = len(inicios) - 1
+    posicion = tokens = bits = 0
+    while posicion < n:
+        mejor = desplazamiento = 0
+        for k in range(inicios[posicion], inicios[posicion + 1]):
+            if desplazamientos[k] > tam_ventana_historia:
+                break
+            mejor, desplazamiento = longitudes[k], desplazamientos[k]
+        mejor = min(mejor, tam_ventana_futura)
+        if mejor >= MIN_CHAIN_MATCH:
+            bits += 1 + _varint_bits(mejor) + _varint_bits(desplazamiento << 1)
+            posicion += mejor
+        else:
+            bits += 9
+            posicion += 1
+        tokens += 1
+    return tokens, bits
+
+
+def _init(candidatos) -> None:
+    _compartido["candidatos"] = [array.tolist() for array in candidatos]
+
+
+def _evaluate(config: tuple[int, int]) -> dict:
+    tam_ventana_historia, tam_ventana_futura = config
+    inicios, desplazamientos, longitudes = _compartido["candidatos"]
+    tokens, bits = parse_cost(
+        inicios, desplazamientos, longitudes, tam_ventana_historia, tam_ventana_futura
+    )
+    n = len(inicios) - 1
+    return {
+        "history": tam_ventana_historia,
+        "lookahead": tam_ventana_futura,
+        "tokens": tokens,
+        "bytes": (bits + 7) // 8,
+        "ratio": n / max((bits + 7) // 8, 1),
+    }
+
+
+def throughput(
+    muestra: bytes,
+    tam_ventana_historia: int,
+    tam_ventana_futura: int,
+    chain_depth: int | None,
+) -> float:
+    """MB/s of a greedy `lzss` pass over `muestra`."""
+    inicio = time.perf_counter()
+    for _ in lzss(
+        muestra,
+        tam_ventana_historia,
+        tam_ventana_futura,
+        lazy=False,
+        chain_depth=chain_depth,
+    ):
+        pass
+    return len(muestra) / max(time.perf_counter() - inicio, 1e-9) / 1e6
+
+
+def pareto_front(rows: list[dict], keys=("ratio", "MB/s")) -> list[bool]:
+    """Whether each row is not dominated on every key (higher is better)."""
+    front = []
+    for row in rows:
+        dominado = any(
+            all(otro[k] >= row[k] for k in keys)
+            and any(otro[k] > row[k] for k in keys)
+            for otro in rows
+        )
+        front.append(not dominado)
+    return front
+
+
+def tune(
+    datos: bytes,
+    histories: list[int] = HISTORIES,
+    lookaheads: list[int] = LOOKAHEADS,
+    chain_depth: int | None = 256,
+    throughput_sample: int = 1 << 15,
+    workers: int | None = None,
+) -> list[dict]:
+    """Evaluate every (history, lookahead) pair on `datos` across a process pool.
+
+    The candidate matches are found once, for the largest window, and every
+    configuration replays its greedy parse from them in the pool. Throughput
+    is then timed here, one configuration after another, by running `lzss`
+    with the same `chain_depth` on the first `throughput_sample` bytes, so
+    concurrent workers do not skew the timings.
+    """
+    candidatos = match_candidates(
+        datos, max(histories), max(lookaheads), chain_depth
+    )
+    configs = list(itertools.product(histories, lookaheads))
+    with ProcessPoolExecutor(
+        workers or os.cpu_count(),
+        initializer=_init,
+        initargs=(candidatos,),
+    ) as pool:
+        rows = list(pool.map(_evaluate, configs))
+    muestra = datos[:throughput_sample]
+    for row in rows:
+        row["MB/s"] = throughput(
+            muestra, row["history"], row["lookahead"], chain_depth
+        )
+    for row, front in zip(rows, pareto_front(rows)):
+        row["pareto"] = front
+    return rows
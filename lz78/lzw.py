@@ -0,0 +1,282 @@
+from array import array
+from collections import OrderedDict
+
+# Control codes, then the first phrase code
+CLEAR = 256
+STOP = 257
+FIRST_CODE = 258
+MIN_BITS = 9
+
+POLICIES = ("freeze", "reset", "lru")
+
+
+def code_width(tamano: int) -> int:
+    """Bits needed for codes 0 .. tamano - 1."""
+    return max(MIN_BITS, (tamano - 1).bit_length())
+
+
+class DiccionarioLZW:
+    """LZW phrase dictionary kept as an array-backed trie.
+
+    Codes 0-255 are the single bytes. Every later code is a node holding its
+    `padre` (the phrase without its last byte) and that last `simbolo`, and
+    the children of a node form a linked list through `hijo` (first child)
+    and `hermano` (next sibling). Encoder and decoder run the same
+    dictionary, so a full dictionary is handled identically on both sides:
+
+    - "freeze": stop adding phrases;
+    - "reset": the encoder sends CLEAR and both start over;
+    - "lru": the least recently used leaf phrase is evicted and its code
+      reused. A phrase that loses its last child becomes the next victim.
+    """
+
+    def __init__(self, max_bits: int = 16, policy: str = "reset"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        if max_bits < MIN_BITS:
+            raise ValueError(f"max_bits must be at least {MIN_BITS}")
+        self.max_bits = max_bits
+        self.policy = policy
+        self.capacidad = 1 << max_bits
+        self.padre = array("i", [-1]) * self.capacidad
+        self.simbolo = array("i", range(256)) + array("i", [0]) * (
+            self.capacidad - 256
+        )
+        self.hijo = array("i", [-1]) * self.capacidad
+        self.hermano = array("i", [-1]) * self.capacidad
+        self.reset()
+
+    def reset(self) -> None:
+        self.hijo[:256] = array("i", [-1]) * 256
+        self.tamano = FIRST_CODE
+        # Leaf phrases, least recently used first
+        self.hojas: OrderedDict[int, None] = OrderedDict()
+
+    @property
+    def lleno(self) -> bool:
+        return self.tamano >= self.capacidad
+
+    def child(self, nodo: int, byte: int) -> int:
+        c = self.hijo[nodo]
+        simbolo, hermano = self.simbolo, self.hermano
+        while c != -1 and simbolo[c] != byte:
+            c = hermano[c]
+        return c
+
+    def touch(self, code: int) -> None:
+        if code in self.hojas:
+            self.hojas.move_to_end(code)
+
+    def next_slot(self, padre: int) -> int:
+        """Code the next phrase under `padre` would get, -1 if none."""
+        if not self.lleno:
+            return self.tamano
+        if self.policy != "lru":
+            return -1
+        for victima in self.hojas:
+            if victima != padre:
+                return victima
+        return -1
+
+    def _unlink(self, code: int) -> None:
+        padre = self.padre[code]
+        if self.hijo[padre] == code:
+            self.hijo[padre] = self.hermano[code]
+        else:
+            c = self.hijo[padre]
+            while self.hermano[c] != code:
+                c = self.hermano[c]
+            self.hermano[c] = self.hermano[code]
+        del self.hojas[code]
+        if self.hijo[padre] == -1 and padre >= FIRST_CODE:
+            self.hojas[padre] = None
+            self.hojas.move_to_end(padre, last=False)
+
+    def add(self, padre: int, byte: int) -> int:
+        """Add phrase `padre` + `byte`; returns its code, or -1 if none was free."""
+        code = self.next_slot(padre)
+        if code == -1:
+            return -1
+        if code == self.tamano:
+            self.tamano += 1
+        else:
+            self._unlink(code)
+        self.padre[code] = padre
+        self.simbolo[code] = byte
+        self.hijo[code] = -1
+        self.hermano[code] = self.hijo[padre]
+        self.hijo[padre] = code
+        self.hojas.pop(padre, None)
+        self.hojas[code] = None
+        return code
+
+
+class LZWEncoder:
+    """Streaming LZW encoder: feed chunks to `update`, then call `finish`.
+
+    Codes are written LSB first with a width that grows with the dictionary,
+    from 9 bits up to `max_bits`. The output starts with one byte holding
+    `max_bits` and the index of the policy.
+    """
+
+    def __init__(self, max_bits: int = 16, policy: str = "reset"):
+        self.diccionario = DiccionarioLZW(max_bits, policy)
+        self.actual = -1
+        self.acumulador = 0
+        self.bits = 0
+        self.cabecera = bytes([max_bits | POLICIES.index(policy) << 5])
+
+    def _emit(self, code: int, tamano: int, salida: bytearray) -> None:
+        self.acumulador |= code << self.bits
+        self.bits += code_width(tamano)
+        while self.bits >= 8:
+            salida.append(self.acumulador & 0xFF)
+            self.acumulador >>= 8
+            self.bits -= 8
+
+    def update(self, datos: bytes) -> bytes:
+        salida = bytearray(self.cabecera)
+        self.cabecera = b""
+        diccionario = self.diccionario
+        actual = self.actual
+        for byte in datos:
+            if actual == -1:
+                actual = byte
+                continue
+            siguiente = diccionario.child(actual, byte)
+            if siguiente != -1:
+                actual = siguiente
+                continue
+            self._emit(actual, diccionario.tamano, salida)
+            diccionario.touch(actual)
+            if diccionario.lleno and diccionario.policy == "reset":
+                self._emit(CLEAR, diccionario.tamano, salida)
+                diccionario.reset()
+            else:
+                diccionario.add(actual, byte)
+            actual = byte
+        self.actual = actual
+        return bytes(salida)
+
+    def finish(self) -> bytes:
+        salida = bytearray(self.cabecera)
+        self.cabecera = b""
+        diccionario = self.diccionario
+        tamano = diccionario.tamano
+        if self.actual != -1:
+            self._emit(self.actual, tamano, salida)
+            # The decoder adds the last pending phrase before reading STOP
+            tamano = min(tamano + 1, diccionario.capacidad)
+        self._emit(STOP, tamano, salida)
+        if self.bits:
+            salida.append(self.acumulador & 0xFF)
+        self.acumulador = self.bits = 0
+        return bytes(salida)
+
+
+class LZWDecoder:
+    """Streaming inverse of `LZWEncoder`; `update` returns the bytes decoded so far."""
+
+    def __init__(self):
+        self.diccionario: DiccionarioLZW | None = None
+        self.cadenas: list[bytes] = []
+        self.previo = -1
+        self.acumulador = 0
+        self.bits = 0
+        self.terminado = False
+
+    def _start(self, cabecera: int) -> None:
+        self.diccionario = DiccionarioLZW(cabecera & 0x1F, POLICIES[cabecera >> 5])
+        self.cadenas = [bytes([i]) for i in range(256)] + [b""] * (
+            self.diccionario.capacidad - 256
+        )
+
+    def update(self, datos: bytes) -> bytes:
+        if self.diccionario is None:
+            if not datos:
+                return b""
+            self._start(datos[0])
+            datos = datos[1:]
+        diccionario = self.diccionario
+        cadenas = self.cadenas
+        salida = bytearray()
+        for byte in datos:
+            if self.terminado:
+                break
+            self.acumulador |= byte << self.bits
+            self.bits += 8
+            while True:
+                previo = self.previo
+                if previo == -1:
+                    tamano = diccionario.tamano
+                else:
+                    tamano = min(diccionario.tamano + 1, diccionario.capacidad)
+                ancho = code_width(tamano)
+                if self.bits < ancho:
+                    break
+                code = self.acumulador & ((1 << ancho) - 1)
+                self.acumulador >>= ancho
+                self.bits -= ancho
+
+                if code == STOP:
+                    self.terminado = True
+                    break
+                if code == CLEAR:
+                    diccionario.reset()
+                    self.previo = -1
+                    continue
+
+                if previo == -1:
+                    cadena = cadenas[code]
+                else:
+                    slot = diccionario.next_slot(previo)
+                    if code == slot:
+                        cadena = cadenas[previo] + cadenas[previo][:1]
+                    else:
+                        cadena = cadenas[code]
+                    nuevo = diccionario.add(previo, cadena[0])
+                    if nuevo != -1:
+                        cadenas[nuevo] = cadenas[previo] + cadena[:1]
+                diccionario.touch(code)
+                salida += cadena
+                self.previo = code
+        return bytes(salida)
+
+    def finish(self) -> bytes:
+        if not self.terminado:
+            raise ValueError("Truncated LZW stream")
+        return b""
+
+
+def encode(data: bytes, max_bits: int = 16, policy: str = "reset") -> bytes:
+    encoder = LZWEncoder(max_bits, policy)
+    return encoder.update(data) + encoder.finish()
+
+
+def decode(payload: bytes) -> bytes:
+    decoder = LZWDecoder()
+    return decoder.update(payload) + decoder.finish()
+
+
+def compress_file(
+    ruta_entrada: str,
+    ruta_salida: str,
+    max_bits: int = 16,
+    policy: str = "reset",
+    tam_bloque: int = 1 << 16,
+) -> None:
+    encoder = LZWEncoder(max_bits, policy)
+    with open(ruta_entrada, "rb") as entrada, open(ruta_salida, "wb") as salida:
+        while bloque := entrada.read(tam_bloque):
+            salida.write(encoder.update(bloque))
+        salida.write(encoder.finish())
+
+
+def decompress_file(
+    ruta_entrada: str, ruta_salida: str, tam_bloque: int = 1 << 16
+) -> None:
+    decoder = LZWDecoder()
+    with open(ruta_entrada, "rb") as entrada, open(ruta_salida, "wb") as salida:
+        while bloque := entrada.read(tam_bloque):
+            salida.write(decoder.update(bloque))
+        salida.write(decoder.finish())
@@ -1,5 +1,4 @@
-from utils import utils
-import polars as pl
+from .utils import utils
 import typer
 
 
@@ -51,6 +50,8 @@ def main(
     optimal: bool = False,
     alpha: int = 0,
 ) -> None:
+    import polars as pl
+
     with open(file, "r", encoding="utf-8") as f:
         text = "".join(f.read().split())
 
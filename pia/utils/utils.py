@@ -1,7 +1,6 @@
 from math import log2
 from typing import Optional
 import heapq
-import matplotlib.pyplot as plt
 
 
 class Node:
@@ -49,6 +48,8 @@ def huffman(frequencies: dict[str, int]) -> tuple[dict[str, str], Node | None]:
 
 
 def plot_tree(root: Node, m: int):
+    import matplotlib.pyplot as plt
+
     _, ax = plt.subplots()
     ax.axis("off")
     ax.set_title(f"m = {m}")
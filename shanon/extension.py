@@ -0,0 +1,284 @@
+from math import log2
+from typing import Iterator
+
+import numpy as np
+
+from huffman.canonical import canonical_codewords
+from teoria_info.bitstream import (
+    WINDOW_BITS,
+    WINDOW_MASK,
+    PrefixDecoder,
+    byte_frequencies,
+    pack_codewords,
+    read_header,
+    read_varint,
+    write_header,
+    write_varint,
+)
+
+from .shanon import shanon_code
+from .utils.utils import sort_and_order_frequencies
+
+CODERS = ("huffman", "shanon")
+
+
+def product_distributions(
+    symbols: list[str], probabilities: np.ndarray, max_order: int, top_k: int
+) -> Iterator[tuple[int, list[str], np.ndarray, np.ndarray, float]]:
+    """Yield the n-th extension of the source for n = 1..max_order.
+
+    Each order is the outer product of the previous, already truncated, order
+    with the single-symbol distribution, cut back to the `top_k` most likely
+    blocks. Every block among the top K has its prefix among the top K of the
+    previous order, so the truncation is exact while memory stays at K * |A|.
+
+    Yields (n, blocks, probabilities, prefix_ids, escape) with the blocks sorted
+    by decreasing probability, `prefix_ids[i] * |A| + symbol` locating block i
+    inside the outer product, and `escape` the mass of the discarded blocks.
+    """
+    sigma = len(symbols)
+    blocks = list(symbols)
+    block_probabilities = np.asarray(probabilities, dtype=np.float64)
+    ids = np.arange(sigma)
+
+    for n in range(1, max_order + 1):
+        if n > 1:
+            joint = np.outer(block_probabilities, probabilities).ravel()
+            if joint.size > top_k:
+                ids = np.argpartition(joint, joint.size - top_k)[-top_k:]
+            else:
+                ids = np.arange(joint.size)
+            ids = ids[np.argsort(-joint[ids], kind="stable")]
+            blocks = [blocks[i // sigma] + symbols[i % sigma] for i in ids.tolist()]
+            block_probabilities = joint[ids]
+        escape = max(0.0, 1.0 - float(block_probabilities.sum()))
+        yield n, blocks, block_probabilities, ids, escape
+
+
+def code_lengths(probabilities: np.ndarray, coder: str = "huffman") -> np.ndarray:
+    """Codeword lengths for probabilities sorted in decreasing order."""
+    if len(probabilities) < 2:
+        return np.zeros(len(probabilities), dtype=np.int64)
+    if coder == "shanon":
+        _, _, lk, _ = shanon_code(probabilities)
+        return lk
+    if coder == "huffman":
+        from huffman.hierarchical import generate_codes, generate_tree
+
+        # Opaque labels, so no block can collide with the "oN"/"origin" nodes
+        labels = [f"#{i}" for i in range(len(probabilities))]
+        codes = generate_codes(
+            generate_tree(list(zip(labels, probabilities.tolist())))
+        )
+        return np.array([len(codes[label]) for label in labels], dtype=np.int64)
+    raise ValueError(f"Unknown coder: {coder}")
+
+
+def escape_code(
+    block_probabilities: np.ndarray, escape: float, coder: str = "huffman"
+) -> tuple[np.ndarray, int]:
+    """Lengths of the kept blocks and of the escape codeword (0 without escape).
+
+    The escape is coded as one more block, placed by its probability.
+    """
+    if escape <= 0:
+        return code_lengths(block_probabilities, coder), 0
+    position = int(np.searchsorted(-block_probabilities, -escape))
+    lengths = code_lengths(np.insert(block_probabilities, position, escape), coder)
+    return np.delete(lengths, position), int(lengths[position])
+
+
+def extension_rates(
+    text: str, max_order: int = 4, top_k: int = 1024, coder: str = "huffman"
+) -> Iterator[dict[str, float]]:
+    """Bits per symbol of coding `text` in blocks of n symbols, n = 1..max_order.
+
+    Blocks outside the top K are sent as an escape codeword followed by their n
+    symbols with the order-1 code. The rates are expected values computed from
+    the distributions; `encode` and `decode` code bytes this way.
+    """
+    frequencies = sort_and_order_frequencies(text)
+    symbols = [char for char, _ in frequencies]
+    counts = np.array([count for _, count in frequencies], dtype=np.float64)
+    probabilities = counts / counts.sum()
+    entropy = -float(probabilities @ np.log2(probabilities))
+
+    single_lengths = code_lengths(probabilities, coder)
+    single_rate = float(probabilities @ single_lengths)
+    # Order-1 bits of every kept block, carried along like the blocks themselves
+    block_bits = single_lengths.astype(np.float64)
+
+    for n, blocks, block_probabilities, ids, escape in product_distributions(
+        symbols, probabilities, max_order, top_k
+    ):
+        if n > 1:
+            sigma = len(symbols)
+            block_bits = block_bits[ids // sigma] + single_lengths[ids % sigma]
+
+        lengths, escape_length = escape_code(block_probabilities, escape, coder)
+        if escape > 0:
+            # Order-1 bits of all blocks minus those of the kept ones
+            escaped_bits = n * single_rate - float(block_probabilities @ block_bits)
+            escaped = escape * escape_length + escaped_bits
+        else:
+            escaped = 0.0
+
+        bits_per_block = float(block_probabilities @ lengths) + escaped
+        yield {
+            "n": n,
+            "blocks": len(blocks),
+            "escape": escape,
+            "bits_per_symbol": bits_per_block / n,
+            "H": entropy,
+            "redundancy": bits_per_block / n - entropy,
+        }
+
+
+def block_code(
+    symbols: np.ndarray, counts: np.ndarray, n: int, top_k: int, coder: str
+) -> tuple[list[bytes], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Canonical code of the n-th extension of a byte source with these counts.
+
+    Returns the kept blocks, the codewords and lengths of those blocks
+    followed by the escape (when blocks were discarded), and the codewords
+    and lengths of the single bytes. It depends on the counts alone, so the
+    decoder rebuilds the same code from the header.
+    """
+    probabilities = counts / counts.sum()
+    single_lengths = np.maximum(code_lengths(probabilities, coder), 1)
+    for _, blocks, block_probabilities, _, escape in product_distributions(
+        [bytes([symbol]) for symbol in symbols.tolist()], probabilities, n, top_k
+    ):
+        pass
+    if len(blocks) == len(symbols) ** n:
+        escape = 0.0
+    else:
+        # Rounding must not leave the discarded blocks without a codeword
+        escape = max(escape, float(block_probabilities[-1]))
+
+    lengths, escape_length = escape_code(block_probabilities, escape, coder)
+    if escape_length:
+        lengths = np.append(lengths, escape_length)
+    lengths = np.maximum(lengths, 1) if len(lengths) == 1 else lengths
+    if max(int(lengths.max()), int(single_lengths.max())) > WINDOW_BITS:
+        raise ValueError(f"Codewords longer than {WINDOW_BITS} bits, lower n or K")
+    return (
+        blocks,
+        canonical_codewords(lengths),
+        lengths,
+        canonical_codewords(single_lengths),
+        single_lengths,
+    )
+
+
+def encode(
+    data: bytes, n: int = 2, top_k: int = 1024, coder: str = "huffman"
+) -> bytes:
+    """Code `data` in blocks of n bytes with the n-th extension of its source.
+
+    A block outside the top K is sent as the escape codeword followed by its
+    n bytes with the order-1 code, and a last partial block as its bytes
+    alone. Layout: n, K and the coder, the byte counts, then the codewords.
+    """
+    if n < 1:
+        raise ValueError("Blocks need at least one symbol")
+    if coder not in CODERS:
+        raise ValueError(f"Unknown coder: {coder}")
+    symbols, counts = byte_frequencies(data)
+    header = (
+        write_varint(n)
+        + write_varint(top_k)
+        + bytes([CODERS.index(coder)])
+        + write_header(symbols, counts)
+    )
+    if not data:
+        return header
+
+    blocks, codewords, lengths, single_codewords, single_lengths = block_code(
+        symbols, counts, n, top_k, coder
+    )
+    # Blocks, the escape and then the single bytes share one id space
+    index = {block: i for i, block in enumerate(blocks)}
+    escape = len(blocks)
+    single = [0] * 256
+    for i, symbol in enumerate(symbols.tolist()):
+        single[symbol] = len(lengths) + i
+
+    ids = []
+    whole = len(data) - len(data) % n
+    for start in range(0, whole, n):
+        block = data[start : start + n]
+        i = index.get(block)
+        if i is None:
+            ids.append(escape)
+            ids.extend(single[byte] for byte in block)
+        else:
+            ids.append(i)
+    ids.extend(single[byte] for byte in data[whole:])
+
+    ids = np.array(ids, dtype=np.int64)
+    all_codewords = np.concatenate((codewords, single_codewords))
+    all_lengths = np.concatenate((lengths, single_lengths))
+    return header + pack_codewords(all_codewords[ids], all_lengths[ids])
+
+
+def decode(payload: bytes) -> bytes:
+    n, offset = read_varint(payload, 0)
+    top_k, offset = read_varint(payload, offset)
+    coder = CODERS[payload[offset]]
+    symbols, counts, used = read_header(payload[offset + 1 :])
+    offset += 1 + used
+    total = int(counts.sum())
+    if not total:
+        return b""
+
+    blocks, codewords, lengths, single_codewords, single_lengths = block_code(
+        symbols, counts, n, top_k, coder
+    )
+    block_decoder = PrefixDecoder(np.arange(len(lengths)), codewords, lengths)
+    single_decoder = PrefixDecoder(symbols, single_codewords, single_lengths)
+    data = payload[offset:] + bytes(8)
+    position = 0
+
+    def read(decoder: PrefixDecoder) -> int:
+        nonlocal position
+        byte = position >> 3
+        window = (
+            int.from_bytes(data[byte : byte + 8], "big") >> (8 - (position & 7))
+        ) & WINDOW_MASK
+        length = decoder.table_length[window >> decoder.shift]
+        if length:
+            symbol = decoder.table_symbol[window >> decoder.shift]
+        else:
+            symbol, length = decoder.slow(window)
+        position += length
+        return symbol
+
+    escape = len(blocks)
+    out = bytearray()
+    while len(out) + n <= total:
+        i = read(block_decoder)
+        if i == escape:
+            out.extend(read(single_decoder) for _ in range(n))
+        else:
+            out += blocks[i]
+    while len(out) < total:
+        out.append(read(single_decoder))
+    return bytes(out)
+
+
+def print_table(rows: list[dict[str, float]]) -> None:
+    import polars as pl
+
+    print(pl.DataFrame(rows))
+
+
+def main():
+    text = "aaaabbbccccddeefgggggh"
+    rows = list(extension_rates(text, max_order=4, top_k=256))
+    print_table(rows)
+    print(f"log2(|A|) = {log2(len(set(text)))}")
+
+
+if __name__ == "__main__":
+    main()
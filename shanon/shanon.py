@@ -1,7 +1,15 @@
 import numpy as np
-import math
-from utils.utils import sort_and_order_frequencies, binary_expansion
-import polars as pl
+from .utils.utils import (
+    sort_and_order_frequencies,
+    truncate_expansions,
+    codeword_strings,
+)
+from teoria_info.bitstream import (
+    byte_frequencies,
+    encode_symbols,
+    decode_symbols,
+    read_header,
+)
 
 
 def print_table(matrix: np.ndarray, binaries: list[tuple[str, str]]):
@@ -11,6 +19,9 @@ def print_table(matrix: np.ndarray, binaries: list[tuple[str, str]]):
     fip = [i[2] for i in matrix]
     lk = [i[3] for i in matrix]
     binary = [i[1] for i in binaries]
+
+    import polars as pl
+
     print(
         pl.DataFrame(
             {
@@ -25,31 +36,52 @@ def print_table(matrix: np.ndarray, binaries: list[tuple[str, str]]):
     )
 
 
-def shanon(text: str) -> None:
+def shanon_code(
+    counts: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Shannon code for `counts` (or probabilities) sorted in decreasing order.
+
+    Returns the columns fi, Fi and lk plus the codewords packed as ints of lk bits.
+    """
+    counts = np.asarray(counts)
+    total = counts.sum()
+    fi = counts / total
+    fip = (np.cumsum(counts) - counts) / total
+    lk = np.ceil(np.log2(total / counts)).astype(np.int64)
+    return fi, fip, lk, truncate_expansions(fip, lk)
+
+
+def shanon(
+    text: str, show_table: bool = True
+) -> tuple[list[str], np.ndarray, np.ndarray]:
     frequencies = sort_and_order_frequencies(text)
-    total_freq = sum(num for _, num in frequencies)
-    base_matrix: np.ndarray = np.zeros((len(frequencies), 4))
-    binaries: list[tuple[str, str]] = []
-    for i in range(len(frequencies)):
-        base_matrix[i, 0] = frequencies[i][1]
-        base_matrix[i, 1] = frequencies[i][1] / total_freq
-        base_matrix[i, 2] = (
-            0 if i == 0 else base_matrix[i - 1, 1] + base_matrix[i - 1, 2]
-        )
-        base_matrix[i, 3] = math.ceil(math.log2(1 / base_matrix[i, 1]))
-        num = float(base_matrix[i, 2])
-        lk = int(base_matrix[i, 3])
-        binaries.append(
-            (
-                frequencies[i][0],
-                "".join(map(str, [i for i in binary_expansion(num, lk)])),
-            )
-        )
-    print_table(base_matrix, binaries)
+    letters = [letter for letter, _ in frequencies]
+    counts = np.fromiter(
+        (num for _, num in frequencies), dtype=np.int64, count=len(frequencies)
+    )
+    fi, fip, lk, codewords = shanon_code(counts)
+
+    if show_table:
+        base_matrix = np.column_stack((counts, fi, fip, lk))
+        print_table(base_matrix, list(zip(letters, codeword_strings(codewords, lk))))
+
+        lms = float(fi @ lk)
+        rc = 8 / lms
+        print(f"lms: {lms} , rc: {rc},  lme: 8")
+
+    return letters, codewords, lk
+
+
+def encode(data: bytes) -> bytes:
+    symbols, counts = byte_frequencies(data)
+    _, _, lk, codewords = shanon_code(counts)
+    return encode_symbols(data, symbols, counts, codewords, lk)
+
 
-    lms = sum(base_matrix[:, 1] * base_matrix[:, 3])
-    rc = 8 / lms
-    print(f"lms: {lms} , rc: {rc},  lme: 8")
+def decode(payload: bytes) -> bytes:
+    symbols, counts, offset = read_header(payload)
+    _, _, lk, codewords = shanon_code(counts)
+    return decode_symbols(payload, offset, symbols, counts, codewords, lk)
 
 
 def main():
@@ -1,6 +1,13 @@
-import polars as pl
+import numpy as np
+from bisect import bisect_left
 from typing import Dict, List, Tuple
-from utils.utils import sort_and_order_frequencies
+from .utils.utils import sort_and_order_frequencies
+from teoria_info.bitstream import (
+    byte_frequencies,
+    encode_symbols,
+    decode_symbols,
+    read_header,
+)
 
 
 def print_table(
@@ -13,6 +20,8 @@ def print_table(
     code_values: List[str] = [codes.get(char, "") for char, _ in frequencies]
     lms: float = sum(p * l for p, l in zip(probabilities, code_lengths))
 
+    import polars as pl
+
     print(
         pl.DataFrame(
             {
@@ -28,44 +37,77 @@ def print_table(
 
 
 def split_frequencies(
-    frequencies: List[Tuple[str, int]], codes: Dict[str, str], current_code: str = ""
-) -> None:
-    if len(frequencies) == 1:
-        codes[frequencies[0][0]] = current_code
-        return
-
-    total: int = sum(f[1] for f in frequencies)
-    cumulative: int = 0
-    best_diff: float = float("inf")
-    split_idx: int = 0
-
-    for i in range(len(frequencies) - 1):
-        cumulative += frequencies[i][1]
-        diff: float = abs(2 * cumulative - total)
-        if diff < best_diff:
-            best_diff = diff
-            split_idx = i
-
-    left: List[Tuple[str, int]] = frequencies[: split_idx + 1]
-    right: List[Tuple[str, int]] = frequencies[split_idx + 1 :]
-
-    if left:
-        split_frequencies(left, codes, current_code + "0")
-    if right:
-        split_frequencies(right, codes, current_code + "1")
+    frequencies: List[Tuple[str, int]],
+) -> Tuple[List[int], List[int]]:
+    """Assign Shannon-Fano codes as (code, length) pairs, one per input row.
+
+    The prefix sums are computed once and every split point is found by
+    bisecting them, with an explicit stack instead of recursion.
+    """
+    n: int = len(frequencies)
+    prefix: List[int] = [0] * (n + 1)
+    for i, (_, freq) in enumerate(frequencies):
+        prefix[i + 1] = prefix[i] + freq
+
+    codes: List[int] = [0] * n
+    lengths: List[int] = [0] * n
+    stack: List[Tuple[int, int, int, int]] = [(0, n, 0, 0)] if n else []
+
+    while stack:
+        lo, hi, code, length = stack.pop()
+        if hi - lo == 1:
+            codes[lo] = code
+            lengths[lo] = length
+            continue
+
+        # First split whose left half weighs at least half of [lo, hi); the
+        # one before it wins ties, as the linear scan kept the earliest best.
+        target: int = prefix[lo] + prefix[hi]
+        split: int = bisect_left(prefix, (target + 1) // 2, lo + 1, hi - 1)
+        if split > lo + 1 and (
+            target - 2 * prefix[split - 1] <= 2 * prefix[split] - target
+        ):
+            split -= 1
+
+        stack.append((split, hi, (code << 1) | 1, length + 1))
+        stack.append((lo, split, code << 1, length + 1))
+
+    return codes, lengths
 
 
 def shannon_fano(text: str) -> Dict[str, str]:
     frequencies: List[Tuple[str, int]] = sort_and_order_frequencies(text)
     total_freq: int = sum(num for _, num in frequencies)
-    codes: Dict[str, str] = {}
-
-    split_frequencies(frequencies, codes)
+    codewords, lengths = split_frequencies(frequencies)
+    codes: Dict[str, str] = {
+        char: format(code, f"0{length}b") if length else ""
+        for (char, _), code, length in zip(frequencies, codewords, lengths)
+    }
     print_table(frequencies, codes, total_freq)
 
     return codes
 
 
+def shannon_fano_code(
+    symbols: np.ndarray, counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    frequencies = [(chr(s), c) for s, c in zip(symbols.tolist(), counts.tolist())]
+    codewords, lengths = split_frequencies(frequencies)
+    return np.array(codewords, dtype=np.uint64), np.array(lengths, dtype=np.int64)
+
+
+def encode(data: bytes) -> bytes:
+    symbols, counts = byte_frequencies(data)
+    codewords, lengths = shannon_fano_code(symbols, counts)
+    return encode_symbols(data, symbols, counts, codewords, lengths)
+
+
+def decode(payload: bytes) -> bytes:
+    symbols, counts, offset = read_header(payload)
+    codewords, lengths = shannon_fano_code(symbols, counts)
+    return decode_symbols(payload, offset, symbols, counts, codewords, lengths)
+
+
 def __run__() -> None:
     text: str = "Jos sä tahdot niin tullen kalioden läpi"
     shannon_fano(text)
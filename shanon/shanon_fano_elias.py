@@ -1,7 +1,15 @@
-from utils.utils import sort_and_order_frequencies, binary_expansion
+from .utils.utils import (
+    sort_and_order_frequencies,
+    truncate_expansions,
+    codeword_strings,
+)
+from teoria_info.bitstream import (
+    byte_frequencies,
+    encode_symbols,
+    decode_symbols,
+    read_header,
+)
 import numpy as np
-import math
-import polars as pl
 
 
 def print_table(
@@ -15,6 +23,9 @@ def print_table(
     fx = [i[0] for i in matrix]
     ix = [i[1] for i in matrix]
     binary = [i[1] for i in binaries]
+
+    import polars as pl
+
     print(
         pl.DataFrame(
             {
@@ -36,29 +47,51 @@ def calculate_fi(frequencies: list[tuple[str, int]]) -> tuple[int, list[float]]:
     return total, fi
 
 
-def shanon_fano_elias(text: str):
+def shanon_fano_elias_code(
+    counts: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Shannon-Fano-Elias code for `counts` sorted in decreasing order.
+
+    Returns the columns fi, F(X) and I(X) plus the codewords packed as ints of I(X) bits.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    total = counts.sum()
+    fi = counts / total
+    fx = (2 * np.cumsum(counts) - counts) / (2 * total)
+    ix = np.ceil(np.log2(total / counts)).astype(np.int64) + 1
+    return fi, fx, ix, truncate_expansions(fx, ix)
+
+
+def shanon_fano_elias(
+    text: str, show_table: bool = True
+) -> tuple[list[str], np.ndarray, np.ndarray]:
     frequencies = sort_and_order_frequencies(text)
-    _, fi = calculate_fi(frequencies)
-    lenght = len(frequencies)
-    matrix: np.ndarray = np.zeros((lenght, 2), dtype=float)
-    binaries: list[tuple[str, str]] = []
-    for i in range(lenght):
-        num = fi[i] / 2 if i == 0 else sum(fi[:i]) + (fi[i] / 2)
-        lk = math.ceil(math.log2((1 / fi[i]) + 1))
-        matrix[i][0] = num
-        matrix[i, 1] = lk
-        binaries.append(
-            (
-                frequencies[i][0],
-                "".join(map(str, [i for i in binary_expansion(num, lk)])),
-            )
-        )
-    print_table(frequencies, fi, matrix, binaries)
-    lms = sum(
-        a * b
-        for a, b in zip(fi, [float(math.ceil(math.log2((1 / i) + 1))) for i in fi])
+    letters = [letter for letter, _ in frequencies]
+    counts = np.fromiter(
+        (freq for _, freq in frequencies), dtype=np.int64, count=len(frequencies)
     )
-    print(f"lms: {lms} lme: {8} RC: {8 / lms}")
+    fi, fx, ix, codewords = shanon_fano_elias_code(counts)
+
+    if show_table:
+        matrix = np.column_stack((fx, ix))
+        binaries = list(zip(letters, codeword_strings(codewords, ix)))
+        print_table(frequencies, fi.tolist(), matrix, binaries)
+        lms = float(fi @ ix)
+        print(f"lms: {lms} lme: {8} RC: {8 / lms}")
+
+    return letters, codewords, ix
+
+
+def encode(data: bytes) -> bytes:
+    symbols, counts = byte_frequencies(data)
+    _, _, ix, codewords = shanon_fano_elias_code(counts)
+    return encode_symbols(data, symbols, counts, codewords, ix)
+
+
+def decode(payload: bytes) -> bytes:
+    symbols, counts, offset = read_header(payload)
+    _, _, ix, codewords = shanon_fano_elias_code(counts)
+    return decode_symbols(payload, offset, symbols, counts, codewords, ix)
 
 
 def main():
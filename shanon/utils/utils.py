@@ -1,5 +1,7 @@
 import collections
 
+import numpy as np
+
 
 def sort_and_order_frequencies(text: str) -> list[tuple[str, int]]:
     frequency = collections.Counter(text.replace(" ", "").replace("\n", "").lower())
@@ -26,3 +28,18 @@ def binary_expansion(num: float, lk: int) -> list[int]:
             history.append(r)
 
     return expansion[:lk] if lk <= len(expansion) else [0] * lk
+
+
+def truncate_expansions(nums: np.ndarray, lk: np.ndarray) -> np.ndarray:
+    """Vectorized `binary_expansion`: the first `lk` bits of each `num`, packed as an int.
+
+    Exact while `lk` stays within the 53 bits of a float64 mantissa.
+    """
+    return np.floor(np.ldexp(nums, lk)).astype(np.uint64)
+
+
+def codeword_strings(codewords: np.ndarray, lk: np.ndarray) -> list[str]:
+    return [
+        format(code, f"0{length}b") if length else ""
+        for code, length in zip(codewords.tolist(), lk.tolist())
+    ]
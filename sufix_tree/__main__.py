@@ -1,23 +1,15 @@
 import json
 
+from .suffix_tree import SuffixTree
+
 
 def main():
-    tree = {}
     word = 'RGFABASABPUEFABASFWFDMOGFOASABASABABASABWM'
-    repeated = []
-    for char in word:
-        if char not in repeated:
-            repeated.append(char)
-
-    for i in range(len(repeated)):
-        aux = 0
-        for j in range(len(word)):
-            if word[j] == repeated[i]:
-                aux = j
-                break
-        tree[i] = word[aux:]
+    tree = SuffixTree(word)
 
-    print(json.dumps(tree, indent=2))
+    print(json.dumps(tree.to_dict(), indent=2))
+    print("Occurrences of 'ABAS':", tree.find_all("ABAS"))
+    print("Longest repeat:", tree.longest_repeat())
 
 
 if __name__ == "__main__":
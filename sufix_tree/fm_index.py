@@ -0,0 +1,338 @@
+import numpy as np
+
+from .suffix_array import suffix_array
+
+# Bits per rank superblock (8 words)
+SUPERBLOQUE = 512
+
+
+class BitVector:
+    """Bit array with O(1) rank: 64-bit words plus a count per 512-bit superblock.
+
+    `words` keeps bit i at bit `i % 64` of word `i // 64`. The cumulative
+    counts cost 32 bits per superblock, 6.25% on top of the bits. `rank1`
+    answers one position with `int.bit_count` on a memoryview;
+    `rank1_many` answers an array of positions with NumPy.
+    """
+
+    def __init__(self, words: np.ndarray, superbloques: np.ndarray | None = None):
+        self.words = words
+        if superbloques is None:
+            por_bloque = np.bitwise_count(words).reshape(-1, SUPERBLOQUE // 64)
+            superbloques = np.zeros(len(por_bloque) + 1, dtype=np.uint32)
+            np.cumsum(por_bloque.sum(axis=1), out=superbloques[1:])
+        self.superbloques = superbloques
+        self._bytes = memoryview(words).cast("B")
+        self._cuentas = memoryview(superbloques).cast("B").cast("I")
+
+    @staticmethod
+    def from_bits(bits: np.ndarray) -> "BitVector":
+        palabras = -(-len(bits) // SUPERBLOQUE) * SUPERBLOQUE // 64
+        empaquetado = np.zeros(palabras * 8, dtype=np.uint8)
+        crudo = np.packbits(bits, bitorder="little")
+        empaquetado[: len(crudo)] = crudo
+        return BitVector(empaquetado.view("<u8"))
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes + self.superbloques.nbytes
+
+    def __getitem__(self, i: int) -> int:
+        return self._bytes[i >> 3] >> (i & 7) & 1
+
+    def rank1(self, i: int) -> int:
+        """Ones among the first `i` bits."""
+        bloque = i >> 9
+        byte = i >> 3
+        cuenta = self._cuentas[bloque]
+        enteros = int.from_bytes(self._bytes[bloque << 6 : byte], "little")
+        cuenta += enteros.bit_count()
+        if i & 7:
+            cuenta += (self._bytes[byte] & ((1 << (i & 7)) - 1)).bit_count()
+        return cuenta
+
+    def get_many(self, i: np.ndarray) -> np.ndarray:
+        return (self.words[i >> 6] >> (i & 63).astype(np.uint64)) & np.uint64(1)
+
+    def rank1_many(self, i: np.ndarray) -> np.ndarray:
+        palabra = i >> 6
+        cuenta = self.superbloques[i >> 9].astype(np.int64)
+        primera = (i >> 9) << 3
+        ultima = len(self.words) - 1
+        for k in range(SUPERBLOQUE // 64):
+            j = primera + k
+            completa = np.bitwise_count(self.words[np.minimum(j, ultima)])
+            cuenta += np.where(j < palabra, completa, 0)
+        resto = (i & 63).astype(np.uint64)
+        mascara = (np.uint64(1) << resto) - np.uint64(1)
+        parcial = np.bitwise_count(self.words[np.minimum(palabra, ultima)] & mascara)
+        return cuenta + parcial.astype(np.int64)
+
+
+class WaveletMatrix:
+    """Sequence of small integers as one `BitVector` per bit, most significant first.
+
+    At every level the sequence is stably split into the values with that
+    bit clear (`ceros[nivel]` of them) followed by those with it set, and
+    the next level stores the split sequence. Following a position down the
+    levels takes one rank per level and ends inside the block of its value,
+    which gives both `access` and `rank` in O(log sigma).
+    """
+
+    def __init__(self, secuencia: np.ndarray, bits: int):
+        self.bits = bits
+        self.niveles: list[BitVector] = []
+        self.ceros: list[int] = []
+        actual = secuencia
+        for nivel in range(bits):
+            bit = (actual >> (bits - 1 - nivel)) & 1
+            self.niveles.append(BitVector.from_bits(bit.astype(np.uint8)))
+            self.ceros.append(int(len(bit) - bit.sum()))
+            actual = np.concatenate((actual[bit == 0], actual[bit == 1]))
+        # Final position of the first occurrence of every value
+        self.inicios = np.zeros(1 << bits, dtype=np.int64)
+        valores, primeros = np.unique(actual, return_index=True)
+        self.inicios[valores] = primeros
+        self._prepare()
+
+    def _prepare(self) -> None:
+        """Python-side copies for the scalar queries, which index them per symbol."""
+        self._inicios = self.inicios.tolist()
+        self._caminos = [
+            [
+                (bloque, ceros, valor >> (self.bits - 1 - nivel) & 1)
+                for nivel, (bloque, ceros) in enumerate(zip(self.niveles, self.ceros))
+            ]
+            for valor in range(1 << self.bits)
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(nivel.nbytes for nivel in self.niveles)
+
+    def access_rank(self, i: int) -> tuple[int, int]:
+        """Value at `i` and how many times it occurs before `i`."""
+        valor = 0
+        for nivel, ceros in zip(self.niveles, self.ceros):
+            unos = nivel.rank1(i)
+            if nivel[i]:
+                valor = valor << 1 | 1
+                i = ceros + unos
+            else:
+                valor <<= 1
+                i -= unos
+        return valor, i - self._inicios[valor]
+
+    def rank(self, valor: int, i: int) -> int:
+        """Occurrences of `valor` among the first `i` values."""
+        for bloque, ceros, bit in self._caminos[valor]:
+            unos = bloque.rank1(i)
+            i = ceros + unos if bit else i - unos
+        return i - self._inicios[valor]
+
+    def access_rank_many(self, i: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        valor = np.zeros(len(i), dtype=np.int64)
+        for nivel, ceros in zip(self.niveles, self.ceros):
+            unos = nivel.rank1_many(i)
+            bit = nivel.get_many(i).astype(bool)
+            valor = valor << 1 | bit
+            i = np.where(bit, ceros + unos, i - unos)
+        return valor, i - self.inicios[valor]
+
+    def rank_many(self, valor: np.ndarray, i: np.ndarray) -> np.ndarray:
+        for nivel, (ceros, bloque) in enumerate(zip(self.ceros, self.niveles)):
+            unos = bloque.rank1_many(i)
+            bit = (valor >> (self.bits - 1 - nivel) & 1).astype(bool)
+            i = np.where(bit, ceros + unos, i - unos)
+        return i - self.inicios[valor]
+
+
+class FMIndex:
+    """FM-index: the BWT of a byte text in a `WaveletMatrix`, plus a sampled SA.
+
+    Backward search narrows the range of suffix-array rows that start with
+    the pattern one symbol at a time, from its end, with two wavelet ranks
+    per symbol (`count`). `locate` walks each row back with LF until a row
+    whose text position is a multiple of `sa_sample`. Those rows are marked
+    in a `BitVector` and their positions kept in `muestras`. The text itself
+    is not kept: the BWT takes log2(sigma + 1) bits per symbol, so 4 bits
+    for DNA. `str` texts and patterns are indexed as UTF-8, so offsets are
+    byte offsets.
+
+    `count_many` and `locate_many` run the same searches vectorized over many
+    patterns at once.
+    """
+
+    def __init__(self, texto, sa_sample: int = 64):
+        if isinstance(texto, str):
+            texto = texto.encode()
+        datos = np.frombuffer(bytes(texto), dtype=np.uint8)
+        n = len(datos)
+        self.n = n
+        self.sa_sample = sa_sample
+
+        # Code 0 is the terminal symbol, smaller than every byte
+        self.alfabeto = np.unique(datos)
+        self.codigo = np.full(256, -1, dtype=np.int64)
+        self.codigo[self.alfabeto] = np.arange(1, len(self.alfabeto) + 1)
+        codigos = self.codigo[datos]
+
+        sa = np.concatenate(([n], suffix_array(texto)))
+        # The symbol before each suffix; index -1 picks the terminal for sa == 0
+        bwt = np.append(codigos, 0)[sa - 1]
+        frecuencias = np.bincount(bwt, minlength=len(self.alfabeto) + 1)
+        self.C = np.concatenate(([0], np.cumsum(frecuencias)[:-1]))
+        self.bwt = WaveletMatrix(bwt, max(1, len(self.alfabeto).bit_length()))
+
+        marcadas = sa % sa_sample == 0
+        self.marcas = BitVector.from_bits(marcadas.astype(np.uint8))
+        self.muestras = (sa[marcadas] // sa_sample).astype(np.uint32)
+        self._prepare()
+
+    def _prepare(self) -> None:
+        self._codigo = self.codigo.tolist()
+        self._C = self.C.tolist()
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the index arrays in bytes."""
+        return (
+            self.bwt.nbytes
+            + self.marcas.nbytes
+            + self.muestras.nbytes
+            + self.C.nbytes
+            + self.codigo.nbytes
+        )
+
+    def _range(self, patron) -> tuple[int, int]:
+        """Half-open range of suffix-array rows starting with `patron`."""
+        if isinstance(patron, str):
+            patron = patron.encode()
+        codigo, C, rank = self._codigo, self._C, self.bwt.rank
+        inicio, fin = 0, self.n + 1
+        for byte in reversed(patron):
+            c = codigo[byte]
+            if c < 0:
+                return 0, 0
+            inicio = C[c] + rank(c, inicio)
+            fin = C[c] + rank(c, fin)
+            if inicio >= fin:
+                return 0, 0
+        return inicio, fin
+
+    def __contains__(self, patron) -> bool:
+        inicio, fin = self._range(patron)
+        return fin > inicio
+
+    def count(self, patron) -> int:
+        """Number of (possibly overlapping) occurrences of `patron`."""
+        inicio, fin = self._range(patron)
+        return fin - inicio
+
+    def _locate_rows(self, filas: np.ndarray) -> np.ndarray:
+        """Text position of every suffix-array row."""
+        pasos = np.zeros(len(filas), dtype=np.int64)
+        posiciones = np.empty(len(filas), dtype=np.int64)
+        pendientes = np.arange(len(filas))
+        while len(pendientes):
+            actuales = filas[pendientes]
+            marcada = self.marcas.get_many(actuales).astype(bool)
+            hechas = pendientes[marcada]
+            muestra = self.muestras[self.marcas.rank1_many(actuales[marcada])]
+            posiciones[hechas] = muestra * np.int64(self.sa_sample) + pasos[hechas]
+            pendientes = pendientes[~marcada]
+            valor, rango = self.bwt.access_rank_many(filas[pendientes])
+            filas[pendientes] = self.C[valor] + rango
+            pasos[pendientes] += 1
+        return posiciones
+
+    def locate(self, patron) -> list[int]:
+        """Sorted 0-based offsets of every occurrence of `patron`."""
+        inicio, fin = self._range(patron)
+        filas = np.arange(inicio, fin, dtype=np.int64)
+        return np.sort(self._locate_rows(filas)).tolist()
+
+    def _ranges_many(self, patrones) -> tuple[np.ndarray, np.ndarray]:
+        patrones = [p.encode() if isinstance(p, str) else bytes(p) for p in patrones]
+        largos = np.array([len(p) for p in patrones], dtype=np.int64)
+        maximo = int(largos.max(initial=0))
+        # Codes right-aligned, so column k holds the k-th symbol from the end
+        codigos = np.zeros((len(patrones), maximo), dtype=np.int64)
+        for fila, p in enumerate(patrones):
+            if p:
+                simbolos = np.frombuffer(p, dtype=np.uint8)
+                codigos[fila, maximo - len(p) :] = self.codigo[simbolos]
+        inicio = np.zeros(len(patrones), dtype=np.int64)
+        fin = np.full(len(patrones), self.n + 1, dtype=np.int64)
+        fin[(codigos < 0).any(axis=1)] = 0
+        for k in range(1, maximo + 1):
+            activos = np.flatnonzero((largos >= k) & (inicio < fin))
+            if not len(activos):
+                break
+            c = codigos[activos, maximo - k]
+            base = self.C[c]
+            inicio[activos] = base + self.bwt.rank_many(c, inicio[activos])
+            fin[activos] = base + self.bwt.rank_many(c, fin[activos])
+        return inicio, np.maximum(fin, inicio)
+
+    def count_many(self, patrones) -> np.ndarray:
+        """`count` of every pattern, by one vectorized backward search."""
+        inicio, fin = self._ranges_many(patrones)
+        return fin - inicio
+
+    def locate_many(self, patrones) -> list[list[int]]:
+        if not len(patrones):
+            return []
+        inicio, fin = self._ranges_many(patrones)
+        cuentas = fin - inicio
+        # Rows inicio[p] .. fin[p] - 1 of every pattern, one after the other
+        antes = np.cumsum(cuentas) - cuentas
+        filas = np.repeat(inicio - antes, cuentas) + np.arange(int(cuentas.sum()))
+        posiciones = self._locate_rows(filas)
+        cortes = np.cumsum(cuentas)[:-1]
+        return [np.sort(grupo).tolist() for grupo in np.split(posiciones, cortes)]
+
+    def save(self, ruta: str) -> None:
+        with open(ruta, "wb") as salida:
+            np.savez(
+                salida,
+                cabecera=np.array(
+                    [self.n, self.sa_sample, self.bwt.bits], dtype=np.int64
+                ),
+                alfabeto=self.alfabeto,
+                C=self.C,
+                ceros=np.array(self.bwt.ceros, dtype=np.int64),
+                niveles=np.stack([nivel.words for nivel in self.bwt.niveles]),
+                cuentas=np.stack([nivel.superbloques for nivel in self.bwt.niveles]),
+                inicios=self.bwt.inicios,
+                marcas=self.marcas.words,
+                muestras=self.muestras,
+            )
+
+
+def load_fm_index(ruta: str) -> FMIndex:
+    """Index written by `FMIndex.save`."""
+    with np.load(ruta) as guardado:
+        indice = FMIndex.__new__(FMIndex)
+        indice.n, indice.sa_sample, bits = guardado["cabecera"].tolist()
+        indice.alfabeto = guardado["alfabeto"]
+        indice.codigo = np.full(256, -1, dtype=np.int64)
+        indice.codigo[indice.alfabeto] = np.arange(1, len(indice.alfabeto) + 1)
+        indice.C = guardado["C"]
+        bwt = WaveletMatrix.__new__(WaveletMatrix)
+        bwt.bits = bits
+        bwt.ceros = guardado["ceros"].tolist()
+        bwt.niveles = [
+            BitVector(words, cuentas)
+            for words, cuentas in zip(guardado["niveles"], guardado["cuentas"])
+        ]
+        bwt.inicios = guardado["inicios"]
+        bwt._prepare()
+        indice.bwt = bwt
+        indice.marcas = BitVector(guardado["marcas"])
+        indice.muestras = guardado["muestras"]
+    indice._prepare()
+    return indice
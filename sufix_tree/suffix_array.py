@@ -0,0 +1,157 @@
+import numpy as np
+
+
+def _codes(texto) -> np.ndarray:
+    if isinstance(texto, str):
+        return np.fromiter(map(ord, texto), dtype=np.int64, count=len(texto))
+    return np.frombuffer(bytes(texto), dtype=np.uint8).astype(np.int64)
+
+
+def suffix_array(texto) -> np.ndarray:
+    """Start offsets of the suffixes of `texto` in lexicographic order.
+
+    Prefix doubling: after the round for `k`, `rango[i]` orders the suffixes
+    by their first 2k symbols, and the next round sorts the pairs
+    `(rango[i], rango[i + k])` packed into one int64 key. It stops as soon
+    as every rank is distinct, after about log2 of the longest repeat
+    rounds of O(n log n) NumPy sorting.
+    """
+    n = len(texto)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    _, rango = np.unique(_codes(texto), return_inverse=True)
+    rango = rango.astype(np.int64)
+    sa = np.argsort(rango, kind="stable")
+    k = 1
+    while rango.max() < n - 1:
+        segundo = np.zeros(n, dtype=np.int64)
+        segundo[: n - k] = rango[k:] + 1
+        clave = rango * (n + 1) + segundo
+        sa = np.argsort(clave)
+        ordenada = clave[sa]
+        rango = np.empty(n, dtype=np.int64)
+        nuevos = np.cumsum(ordenada[1:] != ordenada[:-1])
+        rango[sa] = np.concatenate(([0], nuevos))
+        k *= 2
+    return sa
+
+
+def lcp_array(texto, sa: np.ndarray) -> np.ndarray:
+    """Kasai: `lcp[i]` is the common prefix of suffixes `sa[i - 1]` and `sa[i]`.
+
+    `lcp[0]` is 0. Each suffix starts at most one symbol below the previous
+    one, so the whole pass is O(n).
+    """
+    n = len(texto)
+    t = texto if isinstance(texto, str) else bytes(texto)
+    orden = sa.tolist()
+    rango = [0] * n
+    for i, inicio in enumerate(orden):
+        rango[inicio] = i
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        r = rango[i]
+        if r == 0:
+            h = 0
+            continue
+        j = orden[r - 1]
+        while i + h < n and j + h < n and t[i + h] == t[j + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return np.array(lcp, dtype=np.int64)
+
+
+class SuffixArrayIndex:
+    """Suffix array and LCP array of a text, with the queries built on them.
+
+    `count` and `find_all` binary search the pattern among the sorted
+    suffixes. `longest_repeat` and `distinct_substrings` read the LCP
+    array. `save` stores both arrays in one `.npy` file, and `load_index`
+    memory-maps it back for the same text, so a large corpus is indexed
+    only once.
+    """
+
+    def __init__(self, texto, sa: np.ndarray | None = None, lcp=None):
+        self.texto = texto
+        self.sa = suffix_array(texto) if sa is None else sa
+        self.lcp = lcp_array(texto, self.sa) if lcp is None else lcp
+
+    def __len__(self) -> int:
+        return len(self.texto)
+
+    def _range(self, patron) -> tuple[int, int]:
+        """Half-open range of `sa` whose suffixes start with `patron`."""
+        t, sa, m = self.texto, self.sa, len(patron)
+        bajo, alto = 0, len(sa)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            i = int(sa[medio])
+            if t[i : i + m] < patron:
+                bajo = medio + 1
+            else:
+                alto = medio
+        inicio = bajo
+        alto = len(sa)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            i = int(sa[medio])
+            if t[i : i + m] == patron:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return inicio, bajo
+
+    def __contains__(self, patron) -> bool:
+        inicio, fin = self._range(patron)
+        return fin > inicio
+
+    def count(self, patron) -> int:
+        """Number of (possibly overlapping) occurrences of `patron`."""
+        if not patron:
+            return len(self) + 1
+        inicio, fin = self._range(patron)
+        return fin - inicio
+
+    def find_all(self, patron) -> list[int]:
+        """Sorted 0-based offsets of every occurrence of `patron`."""
+        inicio, fin = self._range(patron)
+        return np.sort(self.sa[inicio:fin]).tolist()
+
+    def longest_repeat(self):
+        """Longest substring occurring at least twice, and its first offset.
+
+        Returns an empty text and -1 when no symbol repeats.
+        """
+        if len(self.lcp) == 0 or not self.lcp.max():
+            return self.texto[:0], -1
+        r = int(np.argmax(self.lcp))
+        largo = int(self.lcp[r])
+        # Every suffix sharing that prefix is next to r in suffix order
+        bajo = r - 1
+        while bajo > 0 and self.lcp[bajo] >= largo:
+            bajo -= 1
+        alto = r + 1
+        while alto < len(self.lcp) and self.lcp[alto] >= largo:
+            alto += 1
+        primera = int(self.sa[bajo:alto].min())
+        return self.texto[primera : primera + largo], primera
+
+    def distinct_substrings(self) -> int:
+        """Distinct non-empty substrings: n(n + 1)/2 minus the LCP total."""
+        n = len(self)
+        return n * (n + 1) // 2 - int(self.lcp.sum())
+
+    def save(self, ruta: str) -> None:
+        with open(ruta, "wb") as salida:
+            np.save(salida, np.stack([self.sa, self.lcp]))
+
+
+def load_index(ruta: str, texto, mmap: bool = True) -> SuffixArrayIndex:
+    """Index saved by `SuffixArrayIndex.save` for `texto`."""
+    arrays = np.load(ruta, mmap_mode="r" if mmap else None)
+    if arrays.shape != (2, len(texto)):
+        raise ValueError(f"{ruta} does not index a text of length {len(texto)}")
+    return SuffixArrayIndex(texto, arrays[0], arrays[1])
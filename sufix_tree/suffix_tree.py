@@ -0,0 +1,281 @@
+from array import array
+
+import numpy as np
+
+# Symbol appended to the text so that every suffix ends in a leaf
+TERMINAL = -1
+
+
+def _symbols(texto) -> array:
+    if isinstance(texto, str):
+        return array("i", map(ord, texto))
+    # A bytes initializer would be read as raw machine values
+    return array("i", iter(bytes(texto)))
+
+
+class SuffixTree:
+    """Suffix tree of a `str` or bytes-like text, built with Ukkonen's algorithm.
+
+    Edges are labelled by `(inicio, fin)` indices into the text instead of
+    copies of it, and the nodes live in parallel `array`s: `inicio`/`fin` of
+    the edge entering a node, its suffix `enlace`, and its children as a
+    linked list through `hijo` (first child) and `hermano` (next sibling),
+    like the LZW trie. Node 0 is the root. A unique terminal symbol is
+    appended, so there is one leaf per suffix and at most 2n nodes.
+
+    Leaves are created with `fin = n`; while building, an edge is read only
+    up to the current position, which is the usual "global end" trick. Leaf
+    counts and string depths are computed once, on the first query that
+    needs them.
+    """
+
+    def __init__(self, texto):
+        self.texto = texto
+        simbolos = _symbols(texto)
+        simbolos.append(TERMINAL)
+        self.simbolos = simbolos
+        n = len(simbolos)
+        capacidad = 2 * n + 1
+        self.inicio = array("i", [0]) * capacidad
+        self.fin = array("i", [0]) * capacidad
+        self.enlace = array("i", [0]) * capacidad
+        self.hijo = array("i", [-1]) * capacidad
+        self.hermano = array("i", [-1]) * capacidad
+        self.padre = array("i", [0]) * capacidad
+        self.nodos = 1
+        self.hojas: np.ndarray | None = None
+        self.profundidad: np.ndarray | None = None
+        self._build()
+
+    def __len__(self) -> int:
+        """Length of the text, without the terminal symbol."""
+        return len(self.simbolos) - 1
+
+    def _build(self) -> None:
+        t = self.simbolos
+        n = len(t)
+        inicio, fin, enlace = self.inicio, self.fin, self.enlace
+        hijo, hermano, padre = self.hijo, self.hermano, self.padre
+        nodos = 1
+
+        nodo_activo = 0
+        arista_activa = 0  # Text index of the first symbol of the active edge
+        largo_activo = 0
+        pendientes = 0
+
+        for pos in range(n):
+            c = t[pos]
+            pendientes += 1
+            ultimo_interno = 0
+            while pendientes:
+                if largo_activo == 0:
+                    arista_activa = pos
+                primero = t[arista_activa]
+                anterior = -1
+                hijo_activo = hijo[nodo_activo]
+                while hijo_activo != -1 and t[inicio[hijo_activo]] != primero:
+                    anterior = hijo_activo
+                    hijo_activo = hermano[hijo_activo]
+
+                if hijo_activo == -1:
+                    # New leaf straight under the active node
+                    inicio[nodos] = pos
+                    fin[nodos] = n
+                    hermano[nodos] = hijo[nodo_activo]
+                    hijo[nodo_activo] = nodos
+                    padre[nodos] = nodo_activo
+                    nodos += 1
+                    if ultimo_interno:
+                        enlace[ultimo_interno] = nodo_activo
+                        ultimo_interno = 0
+                else:
+                    largo_arista = min(fin[hijo_activo], pos + 1) - inicio[hijo_activo]
+                    if largo_activo >= largo_arista:
+                        # Walk down: the active point is past this edge
+                        arista_activa += largo_arista
+                        largo_activo -= largo_arista
+                        nodo_activo = hijo_activo
+                        continue
+                    if t[inicio[hijo_activo] + largo_activo] == c:
+                        # Already in the tree: end this phase
+                        if ultimo_interno and nodo_activo:
+                            enlace[ultimo_interno] = nodo_activo
+                            ultimo_interno = 0
+                        largo_activo += 1
+                        break
+
+                    # Split the edge and hang a new leaf from the split
+                    corte = nodos
+                    hoja = nodos + 1
+                    nodos += 2
+                    inicio[corte] = inicio[hijo_activo]
+                    fin[corte] = inicio[hijo_activo] + largo_activo
+                    hermano[corte] = hermano[hijo_activo]
+                    if anterior == -1:
+                        hijo[nodo_activo] = corte
+                    else:
+                        hermano[anterior] = corte
+                    inicio[hijo_activo] += largo_activo
+                    inicio[hoja] = pos
+                    fin[hoja] = n
+                    hijo[corte] = hoja
+                    hermano[hoja] = hijo_activo
+                    hermano[hijo_activo] = -1
+                    padre[corte] = nodo_activo
+                    padre[hoja] = corte
+                    padre[hijo_activo] = corte
+                    if ultimo_interno:
+                        enlace[ultimo_interno] = corte
+                    ultimo_interno = corte
+
+                pendientes -= 1
+                if nodo_activo == 0 and largo_activo > 0:
+                    largo_activo -= 1
+                    arista_activa = pos - pendientes + 1
+                elif nodo_activo:
+                    nodo_activo = enlace[nodo_activo]
+
+        self.nodos = nodos
+
+    def children(self, nodo: int):
+        c = self.hijo[nodo]
+        while c != -1:
+            yield c
+            c = self.hermano[c]
+
+    def edge(self, nodo: int):
+        """Label of the edge entering `nodo`, without the terminal symbol."""
+        fin = min(self.fin[nodo], len(self))
+        return self.texto[self.inicio[nodo] : fin]
+
+    def _annotate(self) -> None:
+        """Leaves below and string depth of every node, vectorized over the arrays.
+
+        Depths come from pointer jumping up the `padre` links. A child is
+        always deeper than its parent, so leaf counts are pushed up one group
+        of equal depth at a time, deepest first (leaves all at once).
+        """
+        nodos = self.nodos
+        padre = np.frombuffer(self.padre, dtype=np.int32)[:nodos]
+        inicio = np.frombuffer(self.inicio, dtype=np.int32)[:nodos]
+        fin = np.frombuffer(self.fin, dtype=np.int32)[:nodos]
+        hoja = np.frombuffer(self.hijo, dtype=np.int32)[:nodos] == -1
+
+        profundidad = (np.minimum(fin, len(self.simbolos)) - inicio).astype(np.int64)
+        profundidad[0] = 0
+        ancestro = padre.copy()
+        while ancestro.any():
+            profundidad += profundidad[ancestro]
+            ancestro = ancestro[ancestro]
+
+        hojas = hoja.astype(np.int64)
+        np.add.at(hojas, padre[hoja], 1)
+        internos = np.flatnonzero(~hoja)[1:]
+        internos = internos[np.argsort(-profundidad[internos], kind="stable")]
+        cortes = np.flatnonzero(np.diff(profundidad[internos])) + 1
+        for grupo in np.split(internos, cortes):
+            np.add.at(hojas, padre[grupo], hojas[grupo])
+        self.hojas = hojas
+        self.profundidad = profundidad
+
+    def _locate(self, patron) -> tuple[int, int]:
+        """Node whose edge the pattern ends on, and how far down the tree it ends.
+
+        Returns `(-1, 0)` when the pattern does not occur.
+        """
+        p = _symbols(patron)
+        t = self.simbolos
+        inicio, fin = self.inicio, self.fin
+        hijo, hermano = self.hijo, self.hermano
+        nodo = 0
+        i = 0
+        m = len(p)
+        while i < m:
+            c = hijo[nodo]
+            while c != -1 and t[inicio[c]] != p[i]:
+                c = hermano[c]
+            if c == -1:
+                return -1, 0
+            j = inicio[c]
+            final = fin[c]
+            while i < m and j < final:
+                if t[j] != p[i]:
+                    return -1, 0
+                i += 1
+                j += 1
+            nodo = c
+        return nodo, i
+
+    def __contains__(self, patron) -> bool:
+        return self._locate(patron)[0] != -1
+
+    def count(self, patron) -> int:
+        """Number of (possibly overlapping) occurrences of `patron`."""
+        if not patron:
+            return len(self) + 1
+        nodo, _ = self._locate(patron)
+        if nodo == -1:
+            return 0
+        if self.hojas is None:
+            self._annotate()
+        return int(self.hojas[nodo])
+
+    def find_all(self, patron) -> list[int]:
+        """Sorted 0-based offsets of every occurrence of `patron`."""
+        nodo, _ = self._locate(patron)
+        if nodo == -1:
+            return []
+        if self.profundidad is None:
+            self._annotate()
+        n = len(self.simbolos)
+        profundidad, hijo, hermano = self.profundidad, self.hijo, self.hermano
+        resultado = []
+        pila = [nodo]
+        while pila:
+            actual = pila.pop()
+            c = hijo[actual]
+            if c == -1:
+                resultado.append(n - int(profundidad[actual]))
+            while c != -1:
+                pila.append(c)
+                c = hermano[c]
+        resultado.sort()
+        return resultado
+
+    def longest_repeat(self):
+        """Longest substring occurring at least twice, and its first offset.
+
+        That is the label of the deepest internal node. Returns an empty text
+        and -1 when no symbol repeats.
+        """
+        if self.profundidad is None:
+            self._annotate()
+        profundidad, hijo = self.profundidad, self.hijo
+        internos = np.frombuffer(hijo, dtype=np.int32)[: self.nodos] != -1
+        mejor = int(np.argmax(np.where(internos, profundidad, 0)))
+        mejor_largo = int(profundidad[mejor])
+        if not mejor:
+            return self.texto[:0], -1
+        # Any leaf below the node gives an occurrence; the smallest is the first
+        n = len(self.simbolos)
+        pila = [mejor]
+        primera = n
+        while pila:
+            actual = pila.pop()
+            if hijo[actual] == -1:
+                primera = min(primera, n - int(profundidad[actual]))
+            pila.extend(self.children(actual))
+        return self.texto[primera : primera + mejor_largo], primera
+
+    def label(self, nodo: int) -> str:
+        """Printable edge label: bytes as latin-1, "$" for the terminal edge."""
+        etiqueta = self.edge(nodo)
+        if not etiqueta:
+            return "$"
+        if isinstance(etiqueta, str):
+            return etiqueta
+        return bytes(etiqueta).decode("latin-1")
+
+    def to_dict(self, nodo: int = 0) -> dict:
+        """Nested `{edge label: subtree}` view, for printing small trees."""
+        return {self.label(c): self.to_dict(c) for c in self.children(nodo)}
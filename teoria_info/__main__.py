@@ -0,0 +1,3 @@
+from teoria_info.cli import app
+
+app()
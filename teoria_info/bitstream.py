@@ -0,0 +1,164 @@
+import numpy as np
+
+# Codewords up to this length are decoded with a single table lookup
+TABLE_BITS = 12
+# Bits available after aligning an 8 byte window on the current bit
+WINDOW_BITS = 56
+WINDOW_MASK = (1 << WINDOW_BITS) - 1
+
+
+def write_varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def byte_frequencies(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Byte values present in `data` and their counts, by decreasing count."""
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    symbols = np.flatnonzero(counts)
+    order = np.lexsort((symbols, -counts[symbols]))
+    return symbols[order], counts[symbols[order]]
+
+
+def write_header(symbols: np.ndarray, counts: np.ndarray) -> bytearray:
+    header = bytearray(write_varint(len(symbols)))
+    for symbol, count in zip(symbols.tolist(), counts.tolist()):
+        header.append(symbol)
+        header += write_varint(count)
+    return header
+
+
+def read_header(payload: bytes) -> tuple[np.ndarray, np.ndarray, int]:
+    n, offset = read_varint(payload, 0)
+    symbols = np.zeros(n, dtype=np.int64)
+    counts = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        symbols[i] = payload[offset]
+        counts[i], offset = read_varint(payload, offset + 1)
+    return symbols, counts, offset
+
+
+def pack_codewords(
+    codewords: np.ndarray, lengths: np.ndarray, chunk: int = 1 << 16
+) -> bytes:
+    """Concatenate the codewords MSB first and pack them into bytes."""
+    bits = []
+    for start in range(0, len(codewords), chunk):
+        codes = codewords[start : start + chunk]
+        lens = lengths[start : start + chunk]
+        owner = np.repeat(np.arange(len(lens)), lens)
+        shifts = np.cumsum(lens)[owner] - 1 - np.arange(owner.size)
+        bits.append(
+            ((codes[owner] >> shifts.astype(np.uint64)) & 1).astype(np.uint8)
+        )
+    if not bits:
+        return b""
+    return np.packbits(np.concatenate(bits)).tobytes()
+
+
+def encode_symbols(
+    data: bytes,
+    symbols: np.ndarray,
+    counts: np.ndarray,
+    codewords: np.ndarray,
+    lengths: np.ndarray,
+) -> bytes:
+    """Header with the counts followed by the packed codeword of every byte."""
+    code_of = np.zeros(256, dtype=np.uint64)
+    length_of = np.zeros(256, dtype=np.int64)
+    code_of[symbols] = codewords
+    length_of[symbols] = lengths
+    source = np.frombuffer(data, dtype=np.uint8)
+    header = write_header(symbols, counts)
+    return bytes(header + pack_codewords(code_of[source], length_of[source]))
+
+
+class PrefixDecoder:
+    """Lookup tables for a prefix-free code, read from 56-bit windows.
+
+    Codewords up to `TABLE_BITS` long are resolved by one lookup on the top
+    bits of the window; longer ones fall back to `slow`. Symbols of length 0
+    are not in the code.
+    """
+
+    def __init__(
+        self, symbols: np.ndarray, codewords: np.ndarray, lengths: np.ndarray
+    ):
+        self.max_length = int(lengths.max()) if len(lengths) else 0
+        self.peek = peek = max(min(self.max_length, TABLE_BITS), 1)
+        self.shift = WINDOW_BITS - peek
+        self.table_symbol = [0] * (1 << peek)
+        self.table_length = [0] * (1 << peek)
+        self.long_codes: dict[tuple[int, int], int] = {}
+        for symbol, code, length in zip(
+            symbols.tolist(), codewords.tolist(), lengths.tolist()
+        ):
+            if length == 0:
+                continue
+            if length <= peek:
+                first = code << (peek - length)
+                span = 1 << (peek - length)
+                self.table_symbol[first : first + span] = [symbol] * span
+                self.table_length[first : first + span] = [length] * span
+            else:
+                self.long_codes[(length, code)] = symbol
+
+    def slow(self, window: int) -> tuple[int, int]:
+        """(symbol, length) of a codeword longer than the table."""
+        length = self.peek
+        while (length, window >> (WINDOW_BITS - length)) not in self.long_codes:
+            length += 1
+            if length > self.max_length:
+                raise ValueError("Invalid codeword in bitstream")
+        return self.long_codes[(length, window >> (WINDOW_BITS - length))], length
+
+
+def decode_symbols(
+    payload: bytes,
+    offset: int,
+    symbols: np.ndarray,
+    counts: np.ndarray,
+    codewords: np.ndarray,
+    lengths: np.ndarray,
+) -> bytes:
+    """Inverse of `encode_symbols` for a prefix-free code."""
+    total = int(counts.sum())
+    if len(lengths) == 0 or int(lengths.max()) == 0:
+        return bytes(symbols[:1].tolist()) * total
+
+    decoder = PrefixDecoder(symbols, codewords, lengths)
+    table_symbol = decoder.table_symbol
+    table_length = decoder.table_length
+    shift = decoder.shift
+
+    data = payload[offset:] + bytes(8)
+    out = bytearray(total)
+    position = 0
+    for i in range(total):
+        byte = position >> 3
+        window = (
+            int.from_bytes(data[byte : byte + 8], "big") >> (8 - (position & 7))
+        ) & WINDOW_MASK
+        length = table_length[window >> shift]
+        if length:
+            out[i] = table_symbol[window >> shift]
+        else:
+            out[i], length = decoder.slow(window)
+        position += length
+    return bytes(out)
@@ -0,0 +1,493 @@
+"""Single entry point for every coder in the repo.
+
+Each command imports its module on demand, so starting the CLI only pays
+for typer and the command that actually runs.
+"""
+
+from typing import Optional
+
+import typer
+
+app = typer.Typer(no_args_is_help=True)
+
+
+@app.command("shanon")
+def shanon_command(text: str, table: bool = True) -> None:
+    from shanon.shanon import shanon
+
+    shanon(text, show_table=table)
+
+
+@app.command("shannon-fano")
+def shannon_fano_command(text: str) -> None:
+    from shanon.shanon_fano import shannon_fano
+
+    shannon_fano(text)
+
+
+@app.command("sfe")
+def shanon_fano_elias_command(text: str, table: bool = True) -> None:
+    from shanon.shanon_fano_elias import shanon_fano_elias
+
+    shanon_fano_elias(text, show_table=table)
+
+
+@app.command("extension")
+def extension_command(
+    file: str, max_order: int = 4, top_k: int = 1024, coder: str = "huffman"
+) -> None:
+    from shanon.extension import extension_rates, print_table
+
+    with open(file, "r", encoding="utf-8") as f:
+        text = f.read()
+    print_table(list(extension_rates(text, max_order, top_k, coder)))
+
+
+@app.command("huffman")
+def huffman_command(text: str, ternary: bool = False) -> None:
+    from huffman.utils.utils import sort_and_order_frequencies
+
+    frequencies = sort_and_order_frequencies(text)
+    if ternary:
+        from huffman.ternary import generate_table, tree
+
+        generate_table(frequencies, tree(frequencies))
+    else:
+        from huffman.hierarchical import generate_table, generate_tree
+
+        generate_table(frequencies, generate_tree(frequencies))
+
+
+@app.command("adaptive-huffman")
+def adaptive_huffman_command(text: str, method: str = "fgk") -> None:
+    if method == "knuth":
+        from adaptative.knuth import Knuth as Tree
+    elif method == "gallager":
+        from adaptative.gallager import Gallager as Tree
+    else:
+        from adaptative.huffman import AdaptiveHuffmanTree as Tree
+
+    print(Tree().encode(text))
+
+
+@app.command("arithmetic")
+def arithmetic_command(text: str, word: str) -> None:
+    from aritmetic.encoder import arithmetic_encoder, method_one, method_two
+
+    l, alpha, beta = arithmetic_encoder(text, word)
+    method_one(l, alpha, beta)
+    method_two(l, alpha, beta)
+
+
+@app.command("m-grams")
+def m_grams_command(
+    file: str, heuristic: bool = False, optimal: bool = False, alpha: int = 0
+) -> None:
+    from pia.m_grams_huffman import main
+
+    main(file, heuristic=heuristic, optimal=optimal, alpha=alpha)
+
+
+@app.command("lz77")
+def lz77_command(
+    file: str,
+    window_size: int = 38,
+    output: str = "",
+    match_finder: str = "hash",
+    chain_depth: Optional[int] = None,
+    trace: str = "",
+) -> None:
+    from lz77.lz77 import lz77
+
+    history = round(window_size * (2 / 3))
+    output = output or f"results{window_size}.lz77"
+    lz77(
+        file,
+        history,
+        window_size - history,
+        output,
+        match_finder,
+        chain_depth,
+        trace or None,
+    )
+    print(f"Resultados guardados en {output}")
+
+
+@app.command("lz77-stream")
+def lz77_stream_command(
+    file: str,
+    history: int = 32768,
+    lookahead: int = 258,
+    chunk_size: int = 1 << 16,
+    chain_depth: Optional[int] = None,
+    output: str = "",
+) -> None:
+    from lz77.streaming import lz77_stream_file
+    from lz77.token_format import encode_tokens
+
+    output = output or f"{file}.lz77"
+    tokens = lz77_stream_file(file, history, lookahead, chunk_size, chain_depth)
+    with open(output, "wb") as salida:
+        salida.write(encode_tokens(tokens))
+    print(f"Resultados guardados en {output}")
+
+
+@app.command("lzss")
+def lzss_command(
+    file: str,
+    history: int = 32768,
+    lookahead: int = 258,
+    min_match: int = 3,
+    lazy: bool = True,
+    match_finder: str = "hash",
+    chain_depth: Optional[int] = None,
+    optimal: bool = False,
+    block_size: int = 1 << 16,
+    output: str = "",
+) -> None:
+    output = output or f"{file}.lz77"
+    if optimal:
+        from lz77.optimal import optimal_file
+
+        tokens = optimal_file(
+            file,
+            output,
+            history,
+            lookahead,
+            min_match,
+            block_size,
+            chain_depth if chain_depth is not None else 128,
+        )
+    else:
+        from lz77.lzss import lzss_file
+
+        tokens = lzss_file(
+            file,
+            output,
+            history,
+            lookahead,
+            min_match,
+            lazy,
+            match_finder,
+            chain_depth,
+        )
+    print(f"{tokens} tokens guardados en {output}")
+
+
+@app.command("lz77-tune")
+def lz77_tune_command(
+    file: str,
+    history: list[int] = typer.Option([256, 1024, 4096, 16384, 32768]),
+    lookahead: list[int] = typer.Option([8, 16, 32, 64, 258]),
+    limit: int = 1 << 18,
+    chain_depth: Optional[int] = 256,
+    workers: Optional[int] = None,
+) -> None:
+    import polars as pl
+
+    from lz77.tuner import tune
+
+    with open(file, "rb") as f:
+        datos = f.read(limit)
+    rows = tune(datos, history, lookahead, chain_depth, workers=workers)
+    with pl.Config(tbl_rows=-1):
+        print(pl.DataFrame(rows).sort("ratio", descending=True))
+
+
+@app.command("lz77-decompress")
+def lz77_decompress_command(file: str, output: str) -> None:
+    from lz77.decompress import lz77_decompress
+
+    lz77_decompress(file, output)
+    print(f"Resultados guardados en {output}")
+
+
+@app.command("delta")
+def delta_command(reference: str, file: str, output: str, k: int = 16) -> None:
+    import os
+    import time
+
+    from lz77.reference import delta_file
+
+    start = time.perf_counter()
+    delta_file(reference, file, output, k)
+    report(
+        os.path.getsize(file), os.path.getsize(output), time.perf_counter() - start
+    )
+
+
+@app.command("undelta")
+def undelta_command(reference: str, file: str, output: str) -> None:
+    from lz77.reference import undelta_file
+
+    undelta_file(reference, file, output)
+    print(f"Resultados guardados en {output}")
+
+
+@app.command("lzw")
+def lzw_command(
+    file: str, output: str, max_bits: int = 16, policy: str = "reset"
+) -> None:
+    import os
+    import time
+
+    from lz78.lzw import compress_file
+
+    start = time.perf_counter()
+    compress_file(file, output, max_bits, policy)
+    report(
+        os.path.getsize(file), os.path.getsize(output), time.perf_counter() - start
+    )
+
+
+@app.command("lzw-decompress")
+def lzw_decompress_command(file: str, output: str) -> None:
+    from lz78.lzw import decompress_file
+
+    decompress_file(file, output)
+    print(f"Resultados guardados en {output}")
+
+
+@app.command("kmp")
+def kmp_command(pattern: str, text: str) -> None:
+    from kmp.kmp import search
+
+    print(*search(pattern, text))
+
+
+@app.command("kmp-file")
+def kmp_file_command(
+    pattern: str, file: str, chunk_size: int = 1 << 20, mmap: bool = False
+) -> None:
+    from kmp.kmp import search_file
+
+    for offset in search_file(pattern.encode(), file, chunk_size, mmap):
+        print(offset)
+
+
+@app.command("aho-corasick")
+def aho_corasick_command(
+    file: str, patterns: list[str], chunk_size: int = 1 << 20
+) -> None:
+    from kmp.aho_corasick import search_file
+
+    encoded = [pattern.encode() for pattern in patterns]
+    for offset, index in search_file(encoded, file, chunk_size):
+        print(offset, patterns[index])
+
+
+@app.command("boyer-moore")
+def boyer_moore_command(
+    pattern: str, text: str, visualize: bool = False, variant: str = "boyer-moore"
+) -> None:
+    from boyer_moore.boyer_moore import search
+
+    print(*search(text, pattern, visualize=visualize, variant=variant))
+
+
+@app.command("suffix-tree")
+def suffix_tree_command(word: str) -> None:
+    import json
+
+    from sufix_tree.suffix_tree import SuffixTree
+
+    print(json.dumps(SuffixTree(word).to_dict(), indent=2))
+
+
+@app.command("suffix-tree-file")
+def suffix_tree_file_command(
+    file: str,
+    patterns: list[str] = typer.Option([], "--pattern"),
+    longest_repeat: bool = False,
+) -> None:
+    from sufix_tree.suffix_tree import SuffixTree
+
+    with open(file, "rb") as handle:
+        tree = SuffixTree(handle.read())
+    for pattern in patterns:
+        print(pattern, tree.count(pattern.encode()))
+    if longest_repeat:
+        repeat, offset = tree.longest_repeat()
+        print(f"Longest repeat: {len(repeat)} bytes at offset {offset}")
+
+
+@app.command("suffix-array")
+def suffix_array_command(
+    file: str,
+    patterns: list[str] = typer.Option([], "--pattern"),
+    index: Optional[str] = None,
+    longest_repeat: bool = False,
+    distinct: bool = False,
+) -> None:
+    import os
+
+    from sufix_tree.suffix_array import SuffixArrayIndex, load_index
+
+    with open(file, "rb") as handle:
+        data = handle.read()
+    if index and os.path.exists(index):
+        suffixes = load_index(index, data)
+    else:
+        suffixes = SuffixArrayIndex(data)
+        if index:
+            suffixes.save(index)
+    for pattern in patterns:
+        print(pattern, suffixes.count(pattern.encode()))
+    if longest_repeat:
+        repeat, offset = suffixes.longest_repeat()
+        print(f"Longest repeat: {len(repeat)} bytes at offset {offset}")
+    if distinct:
+        print(f"Distinct substrings: {suffixes.distinct_substrings()}")
+
+
+@app.command("fm-index")
+def fm_index_command(
+    file: str,
+    patterns: list[str] = typer.Option([], "--pattern"),
+    index: Optional[str] = None,
+    locate: bool = False,
+    sa_sample: int = 64,
+) -> None:
+    import os
+
+    from sufix_tree.fm_index import FMIndex, load_fm_index
+
+    if index and os.path.exists(index):
+        fm = load_fm_index(index)
+    else:
+        with open(file, "rb") as handle:
+            fm = FMIndex(handle.read(), sa_sample)
+        if index:
+            fm.save(index)
+    print(f"Index: {fm.nbytes} bytes for {len(fm)} bytes of text")
+    encoded = [pattern.encode() for pattern in patterns]
+    if locate:
+        for pattern, offsets in zip(patterns, fm.locate_many(encoded)):
+            print(pattern, *offsets)
+    else:
+        for pattern, count in zip(patterns, fm.count_many(encoded)):
+            print(pattern, count)
+
+
+@app.command("channel-capacity")
+def channel_capacity_command(
+    probabilities: list[float] = typer.Option([0.19, 0.38, 0.15, 0.28]),
+    reliability: float = 0.95,
+    output: str = "capacidad_del_canal.txt",
+) -> None:
+    from channels.channel_capacity import capacidad_del_canal
+
+    print(capacidad_del_canal(probabilities, reliability, output))
+
+
+@app.command("transmitted-info")
+def transmitted_info_command(
+    probabilities: list[float] = typer.Option([0.19, 0.38, 0.15, 0.28]),
+    reliability: float = 0.95,
+    output: str = "informacion_transmitida.txt",
+) -> None:
+    from informacion_mye.transmited_info import informacion_transmitida_del_canal
+
+    print(informacion_transmitida_del_canal(probabilities, reliability, output))
+
+
+@app.command("compress")
+def compress_command(
+    file: str, output: str, codec: str = "shanon", block_size: int = 1 << 18
+) -> None:
+    import time
+
+    from teoria_info.codecs import get_codec
+    from teoria_info.container import compress_stream
+
+    start = time.perf_counter()
+    with open(file, "rb") as src, open(output, "wb") as dst:
+        compress_stream(src, dst, get_codec(codec), block_size)
+        report(src.tell(), dst.tell(), time.perf_counter() - start)
+
+
+@app.command("decompress")
+def decompress_command(file: str, output: str) -> None:
+    import time
+
+    from teoria_info.codecs import get_codec
+    from teoria_info.container import decompress_stream
+
+    start = time.perf_counter()
+    with open(file, "rb") as src, open(output, "wb") as dst:
+        decompress_stream(src, dst, get_codec)
+        report(dst.tell(), src.tell(), time.perf_counter() - start)
+
+
+@app.command("parallel-compress")
+def parallel_compress_command(
+    file: str,
+    output: str,
+    block_size: int = 1 << 20,
+    prime: int = 1 << 15,
+    optimal: bool = False,
+    workers: Optional[int] = None,
+) -> None:
+    import time
+
+    from lz77.parallel import compress_parallel
+
+    start = time.perf_counter()
+    with open(file, "rb") as src, open(output, "wb") as dst:
+        compress_parallel(src, dst, block_size, prime, optimal, workers)
+        report(src.tell(), dst.tell(), time.perf_counter() - start)
+
+
+@app.command("parallel-decompress")
+def parallel_decompress_command(
+    file: str, output: str, workers: Optional[int] = None
+) -> None:
+    import time
+
+    from lz77.parallel import decompress_parallel
+
+    start = time.perf_counter()
+    with open(file, "rb") as src, open(output, "wb") as dst:
+        decompress_parallel(src, dst, workers)
+        report(dst.tell(), src.seek(0, 2), time.perf_counter() - start)
+
+
+@app.command("bwt-compress")
+def bwt_compress_command(
+    file: str,
+    output: str,
+    block_size: int = 900_000,
+    workers: Optional[int] = None,
+) -> None:
+    import os
+    import time
+
+    from bwt.block_sort import compress_file
+
+    start = time.perf_counter()
+    compress_file(file, output, block_size, workers)
+    report(
+        os.path.getsize(file), os.path.getsize(output), time.perf_counter() - start
+    )
+
+
+@app.command("bwt-decompress")
+def bwt_decompress_command(
+    file: str, output: str, workers: Optional[int] = None
+) -> None:
+    import os
+    import time
+
+    from bwt.block_sort import decompress_file
+
+    start = time.perf_counter()
+    decompress_file(file, output, workers)
+    report(
+        os.path.getsize(output), os.path.getsize(file), time.perf_counter() - start
+    )
+
+
+def report(raw_size: int, packed_size: int, elapsed: float) -> None:
+    print(f"{raw_size} bytes <-> {packed_size} bytes")
+    print(f"RC: {raw_size / max(packed_size, 1):.4f}")
+    print(f"Throughput: {raw_size / elapsed / 1e6:.2f} MB/s ({elapsed:.3f} s)")
@@ -0,0 +1,21 @@
+import importlib
+
+from teoria_info.container import Codec
+
+# Codec name -> module exposing encode/decode, imported on first use
+CODEC_MODULES: dict[str, str] = {
+    "shanon": "shanon.shanon",
+    "shannon-fano": "shanon.shanon_fano",
+    "sfe": "shanon.shanon_fano_elias",
+    "extension": "shanon.extension",
+    "deflate": "lz77.deflate",
+    "lzw": "lz78.lzw",
+    "bwt": "bwt.block_sort",
+}
+
+
+def get_codec(name: str) -> Codec:
+    if name not in CODEC_MODULES:
+        raise ValueError(f"Unknown codec: {name}")
+    module = importlib.import_module(CODEC_MODULES[name])
+    return Codec(name, module.encode, module.decode)
@@ -0,0 +1,51 @@
+from typing import BinaryIO, Callable, NamedTuple
+
+from teoria_info.bitstream import write_varint
+
+MAGIC = b"TINF"
+
+
+class Codec(NamedTuple):
+    name: str
+    encode: Callable[[bytes], bytes]
+    decode: Callable[[bytes], bytes]
+
+
+def read_stream_varint(src: BinaryIO) -> int:
+    value = 0
+    shift = 0
+    while True:
+        byte = src.read(1)
+        if not byte:
+            raise ValueError("Truncated container")
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def compress_stream(
+    src: BinaryIO, dst: BinaryIO, codec: Codec, block_size: int = 1 << 18
+) -> None:
+    """Encode `src` block by block: [raw size][payload size][payload] ... [0]."""
+    name = codec.name.encode()
+    dst.write(MAGIC + bytes([len(name)]) + name)
+    while block := src.read(block_size):
+        payload = codec.encode(block)
+        dst.write(write_varint(len(block)) + write_varint(len(payload)))
+        dst.write(payload)
+    dst.write(write_varint(0))
+
+
+def decompress_stream(
+    src: BinaryIO, dst: BinaryIO, get_codec: Callable[[str], Codec]
+) -> None:
+    if src.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a compressed container")
+    codec = get_codec(src.read(src.read(1)[0]).decode())
+
+    while raw_size := read_stream_varint(src):
+        block = codec.decode(src.read(read_stream_varint(src)))
+        if len(block) != raw_size:
+            raise ValueError("Corrupt block")
+        dst.write(block)